@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+简报归档索引
+把 output/archive/*.md 的标题、来源、各板块条数、内容哈希和逐条新闻指纹（取自简报IR）保存到SQLite，
+每次只重新解析 mtime/大小/哈希发生变化的文件，各脚本统一查询索引而不是重复解析Markdown
+"""
+
+import os
+import re
+import json
+import time
+import sqlite3
+import hashlib
+
+import near_dup
+import fingerprint
+import briefing_ir
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.dirname(SCRIPT_DIR)
+
+ARCHIVE_DIR = os.path.join(PROJECT_DIR, 'output', 'archive')
+INDEX_FILE = os.getenv('ARCHIVE_INDEX', os.path.join(PROJECT_DIR, '.cache', 'archive_index.sqlite'))
+
+DATE_FILE_PATTERN = re.compile(r'^(\d{4}-\d{2}-\d{2})\.md$')
+
+# 索引结构变化时递增，旧索引会被清空重建
+INDEX_VERSION = 4
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS briefings (
+    date TEXT PRIMARY KEY,
+    filename TEXT NOT NULL,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL,
+    content_hash TEXT NOT NULL,
+    title TEXT,
+    intro TEXT,
+    headlines TEXT NOT NULL,
+    sources TEXT NOT NULL,
+    section_counts TEXT NOT NULL,
+    item_count INTEGER NOT NULL,
+    indexed_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS item_fingerprints (
+    fingerprint TEXT NOT NULL,
+    date TEXT NOT NULL,
+    title TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_item_fingerprints ON item_fingerprints (fingerprint);
+CREATE INDEX IF NOT EXISTS idx_item_fingerprints_date ON item_fingerprints (date);
+"""
+
+def connect(index_file=None):
+    """打开索引数据库（不存在时创建）"""
+    index_file = index_file or INDEX_FILE
+    os.makedirs(os.path.dirname(index_file), exist_ok=True)
+
+    conn = sqlite3.connect(index_file)
+    conn.row_factory = sqlite3.Row
+
+    if conn.execute("PRAGMA user_version").fetchone()[0] != INDEX_VERSION:
+        conn.executescript("""
+            DROP TABLE IF EXISTS briefings;
+            DROP TABLE IF EXISTS minhash_signatures;
+            DROP TABLE IF EXISTS minhash_buckets;
+            DROP TABLE IF EXISTS item_fingerprints;
+        """)
+        conn.execute(f"PRAGMA user_version = {INDEX_VERSION}")
+
+    conn.executescript(SCHEMA)
+    near_dup.ensure_schema(conn)
+    return conn
+
+def summarize_briefing(briefing):
+    """从简报IR提取索引字段"""
+    section_counts = {section.title.strip(): len(section.items) for section in briefing.sections}
+    items = list(briefing.iter_items())
+
+    return {
+        'title': briefing.title,
+        'intro': briefing.intro,
+        'headlines': [[item.tag, item.title] for item in items if item.tag is not None],
+        'sources': list(dict.fromkeys(item.source for item in items if item.source)),
+        'section_counts': section_counts,
+        'item_count': sum(section_counts.values())
+    }
+
+def index_fingerprints(conn, date, briefing):
+    """重建某一天所有新闻条目的标题/URL指纹"""
+    conn.execute("DELETE FROM item_fingerprints WHERE date = ?", (date,))
+    for item in briefing.iter_items():
+        title, fingerprints = fingerprint.item_fingerprints(item)
+        conn.executemany(
+            "INSERT INTO item_fingerprints VALUES (?, ?, ?)",
+            [(fp, date, title) for fp in dict.fromkeys(fingerprints)]
+        )
+
+def refresh(archive_dir=None, conn=None):
+    """同步索引与归档目录，返回重新解析的文件数
+
+    mtime和大小都未变的文件直接跳过；变了但内容哈希相同的只更新mtime。
+    """
+    archive_dir = archive_dir or ARCHIVE_DIR
+    own_conn = conn is None
+    conn = conn or connect()
+
+    indexed = {row['date']: row for row in conn.execute(
+        "SELECT date, mtime, size, content_hash FROM briefings")}
+    seen = set()
+    changed = 0
+
+    with conn:
+        for entry in os.scandir(archive_dir) if os.path.isdir(archive_dir) else []:
+            match = DATE_FILE_PATTERN.match(entry.name)
+            if not match:
+                continue
+
+            date = match.group(1)
+            seen.add(date)
+            stat = entry.stat()
+            row = indexed.get(date)
+
+            if row and row['mtime'] == stat.st_mtime and row['size'] == stat.st_size:
+                continue
+
+            with open(entry.path, 'rb') as f:
+                raw = f.read()
+            content_hash = hashlib.sha256(raw).hexdigest()
+
+            if row and row['content_hash'] == content_hash:
+                conn.execute("UPDATE briefings SET mtime = ?, size = ? WHERE date = ?",
+                             (stat.st_mtime, stat.st_size, date))
+                continue
+
+            content = raw.decode('utf-8', errors='replace')
+            briefing = briefing_ir.load(entry.path)
+            summary = summarize_briefing(briefing)
+            conn.execute(
+                "INSERT OR REPLACE INTO briefings VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (date, entry.name, stat.st_mtime, stat.st_size, content_hash,
+                 summary['title'], summary['intro'],
+                 json.dumps(summary['headlines'], ensure_ascii=False),
+                 json.dumps(summary['sources'], ensure_ascii=False),
+                 json.dumps(summary['section_counts'], ensure_ascii=False),
+                 summary['item_count'], time.time())
+            )
+            near_dup.index_briefing(conn, date, content)
+            index_fingerprints(conn, date, briefing)
+            changed += 1
+
+        for date in set(indexed) - seen:
+            conn.execute("DELETE FROM briefings WHERE date = ?", (date,))
+            near_dup.remove(conn, date)
+            conn.execute("DELETE FROM item_fingerprints WHERE date = ?", (date,))
+
+    if own_conn:
+        conn.close()
+
+    return changed
+
+def _row_to_dict(row):
+    briefing = dict(row)
+    for key in ('headlines', 'sources', 'section_counts'):
+        briefing[key] = json.loads(briefing[key])
+    briefing['headlines'] = [tuple(h) for h in briefing['headlines']]
+    return briefing
+
+def list_briefings(limit=None, before=None, archive_dir=None, auto_refresh=True):
+    """按日期倒序列出索引中的简报（before: 只返回早于该日期的简报）"""
+    conn = connect()
+    try:
+        if auto_refresh:
+            refresh(archive_dir, conn)
+
+        query = "SELECT * FROM briefings"
+        params = []
+        if before:
+            query += " WHERE date < ?"
+            params.append(before)
+        query += " ORDER BY date DESC"
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        return [_row_to_dict(row) for row in conn.execute(query, params)]
+    finally:
+        conn.close()
+
+def get_briefing(date, archive_dir=None, auto_refresh=True):
+    """查询单日简报的索引信息，不存在时返回None"""
+    conn = connect()
+    try:
+        if auto_refresh:
+            refresh(archive_dir, conn)
+        row = conn.execute("SELECT * FROM briefings WHERE date = ?", (date,)).fetchone()
+        return _row_to_dict(row) if row else None
+    finally:
+        conn.close()
+
+def find_near_duplicates(content, kind='briefing', threshold=0.7, exclude_date=None,
+                         archive_dir=None, auto_refresh=True):
+    """在整个归档中查找与content近似重复的简报（kind='item'时按单条新闻查找）
+
+    返回 [(key, date, 相似度)]，相似度为MinHash估计的Jaccard系数。
+    """
+    conn = connect()
+    try:
+        if auto_refresh:
+            refresh(archive_dir, conn)
+        return near_dup.query(conn, near_dup.signature(content), kind=kind,
+                              threshold=threshold, exclude_date=exclude_date)
+    finally:
+        conn.close()
+
+def find_near_duplicate_items(items, threshold=0.7, exclude_date=None,
+                              archive_dir=None, auto_refresh=True):
+    """逐条查找与归档中单条新闻近似重复的条目（共用一次连接和刷新）
+
+    items为每条新闻的Markdown原文，返回与之一一对应的 [[(key, date, 相似度)]]。
+    """
+    conn = connect()
+    try:
+        if auto_refresh:
+            refresh(archive_dir, conn)
+        return [near_dup.query(conn, near_dup.signature(item), kind='item',
+                               threshold=threshold, exclude_date=exclude_date)
+                for item in items]
+    finally:
+        conn.close()
+
+def load_fingerprints(exclude_date=None, archive_dir=None, auto_refresh=True):
+    """读取整个归档的新闻指纹 {指纹: (最早出现日期, 标题)}，供逐条O(1)查重"""
+    conn = connect()
+    try:
+        if auto_refresh:
+            refresh(archive_dir, conn)
+        rows = conn.execute(
+            "SELECT fingerprint, date, title FROM item_fingerprints WHERE date != ? ORDER BY date",
+            (exclude_date or '',)
+        )
+        seen = {}
+        for row in rows:
+            seen.setdefault(row['fingerprint'], (row['date'], row['title']))
+        return seen
+    finally:
+        conn.close()
+
+def load_item_titles(exclude_date=None, archive_dir=None, auto_refresh=True):
+    """列出归档中出现过的所有新闻标题 [(标题, 最早出现日期)]"""
+    conn = connect()
+    try:
+        if auto_refresh:
+            refresh(archive_dir, conn)
+        rows = conn.execute(
+            "SELECT title, MIN(date) AS date FROM item_fingerprints "
+            "WHERE date != ? AND title != '' GROUP BY title ORDER BY date",
+            (exclude_date or '',)
+        )
+        return [(row['title'], row['date']) for row in rows]
+    finally:
+        conn.close()
+
+if __name__ == '__main__':
+    start = time.monotonic()
+    changed = refresh()
+    total = len(list_briefings(auto_refresh=False))
+    print(f"✅ 归档索引已更新：{changed} 个文件重新解析，共 {total} 份简报（{time.monotonic() - start:.2f}s）")
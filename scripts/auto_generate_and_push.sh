@@ -41,20 +41,16 @@ if [ ! -f "preview/$TODAY.md" ]; then
     exit 1
 fi
 
-# 4. 转换为HTML（紫色主题）
+# 4. 转换为HTML（紫色主题，样式/脚本引用共享的 assets/purple.<hash>.css/.js）
+# 5. 只写一份正本 $TODAY.html，archive/ 和 output/archive/ 下生成跳转页
 echo "🎨 正在转换为紫色主题HTML..." | tee -a "$LOG_FILE"
-python3 scripts/md_to_purple_html.py "output/archive/$TODAY.md" > "$TODAY.html" 2>&1
+python3 scripts/output_layout.py publish "$TODAY" --assets >> "$LOG_FILE" 2>&1
 
 if [ $? -ne 0 ]; then
     echo "❌ HTML转换失败" | tee -a "$LOG_FILE"
     exit 1
 fi
 
-# 5. 复制到各位置
-echo "📋 正在复制文件到各位置..." | tee -a "$LOG_FILE"
-cp "$TODAY.html" "archive/$TODAY.html" 2>&1 | tee -a "$LOG_FILE"
-cp "$TODAY.html" "output/archive/$TODAY.html" 2>&1 | tee -a "$LOG_FILE"
-
 # 6. 检查主题
 echo "🔍 正在检查主题..." | tee -a "$LOG_FILE"
 if ! grep -q "667eea" "$TODAY.html"; then
@@ -64,7 +60,7 @@ fi
 
 # 7. 提交到Git
 echo "📤 正在提交到Git..." | tee -a "$LOG_FILE"
-git add output/archive/$TODAY.md "$TODAY.html" archive/$TODAY.html output/archive/$TODAY.html preview/$TODAY.md >> "$LOG_FILE" 2>&1
+git add output/archive/$TODAY.md "$TODAY.html" assets/ archive/$TODAY.html output/archive/$TODAY.html preview/$TODAY.md >> "$LOG_FILE" 2>&1
 
 if git diff --staged --quiet; then
     echo "⚠️  没有新的变更需要提交" | tee -a "$LOG_FILE"
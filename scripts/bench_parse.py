@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+列表页解析基准测试
+对比完整解析（html.parser + 全文select）与解析层（最快解析器 + SoupStrainer）的耗时
+
+用法: python3 scripts/bench_parse.py [fixture目录] [--rounds N]
+fixture目录可以是 fetch_real_news.py --record 录制的回放目录（按来源URL查找列表页），
+也可以放置以来源id开头的HTML文件，如 court.html、spp-20260301.html
+默认目录 fixtures/bench/ 里是两个按门户结构手工构造的列表页（spp为GB2312编码），
+它们不是录制格式，不能用于 --replay
+"""
+
+import os
+import sys
+import glob
+import time
+import argparse
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.dirname(SCRIPT_DIR)
+sys.path.insert(0, SCRIPT_DIR)
+
+from bs4 import BeautifulSoup
+
+from fetch_real_news import load_sources
+from html_parse import PARSER, detect_encoding, parse_listing
+from http_session import load_fixture
+
+BENCH_FIXTURE_DIR = os.path.join(PROJECT_DIR, 'fixtures', 'bench')
+
+
+def legacy_parse(markup, selectors):
+    """原实现：完整解析整个页面后依次尝试选择器"""
+    soup = BeautifulSoup(markup, 'html.parser')
+    for selector in selectors:
+        elements = soup.select(selector)
+        if elements:
+            return selector, elements
+    return None, soup.find_all('a', href=True)
+
+def time_rounds(func, rounds):
+    """重复执行并返回每轮平均耗时（毫秒）"""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        func()
+    return (time.perf_counter() - start) * 1000 / rounds
+
+def find_source(sources, filename):
+    """根据fixture文件名前缀匹配来源"""
+    name = os.path.basename(filename)
+    for source in sources:
+        if name == f"{source['id']}.html" or name.startswith(f"{source['id']}-"):
+            return source
+    return None
+
+def collect_fixtures(fixture_dir, sources):
+    """收集 (名称, 来源, 页面字节) 列表：先找录制的列表页，再找HTML文件"""
+    fixtures = []
+
+    for source in sources:
+        meta, content = load_fixture(fixture_dir, 'GET', source['url'])
+        if meta and meta['status'] == 200:
+            fixtures.append((f"{source['id']} (录制)", source, content))
+
+    for path in sorted(glob.glob(os.path.join(fixture_dir, '*.html'))):
+        source = find_source(sources, path)
+        if not source:
+            print(f"⚠️  跳过（无对应来源）: {path}")
+            continue
+        with open(path, 'rb') as f:
+            fixtures.append((os.path.basename(path), source, f.read()))
+
+    return fixtures
+
+def main():
+    parser = argparse.ArgumentParser(description='列表页解析基准测试')
+    parser.add_argument('fixture_dir', nargs='?', default=BENCH_FIXTURE_DIR)
+    parser.add_argument('--rounds', type=int, default=20)
+    args = parser.parse_args()
+
+    sources = load_sources(include_disabled=True)
+    fixtures = collect_fixtures(args.fixture_dir, sources)
+    if not fixtures:
+        print(f"❌ 未找到fixture: {args.fixture_dir}")
+        sys.exit(1)
+
+    print(f"🧪 解析器: {PARSER}，每个文件 {args.rounds} 轮")
+    print("-" * 72)
+    print(f"{'文件':<28}{'大小':>8}{'原实现(ms)':>14}{'解析层(ms)':>14}{'加速':>8}")
+
+    total_legacy = total_new = 0
+    for name, source, content in fixtures:
+        markup = content.decode(detect_encoding(content), errors='replace')
+        selectors = source['selectors']
+
+        legacy_selector, legacy_elements = legacy_parse(markup, selectors)
+        new_selector, new_elements = parse_listing(markup, selectors)
+        if legacy_selector != new_selector or len(legacy_elements) != len(new_elements):
+            print(f"⚠️  结果不一致: {name}（{legacy_selector}/{len(legacy_elements)} vs "
+                  f"{new_selector}/{len(new_elements)}）")
+
+        legacy_ms = time_rounds(lambda: legacy_parse(markup, selectors), args.rounds)
+        new_ms = time_rounds(lambda: parse_listing(markup, selectors), args.rounds)
+        total_legacy += legacy_ms
+        total_new += new_ms
+
+        print(f"{name:<28}{len(content) // 1024:>6}KB"
+              f"{legacy_ms:>14.2f}{new_ms:>14.2f}{legacy_ms / new_ms:>7.1f}x")
+
+    if total_new:
+        print("-" * 72)
+        print(f"{'合计':<34}{total_legacy:>14.2f}{total_new:>14.2f}{total_legacy / total_new:>7.1f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+简报解析/渲染基准测试
+1. 对整个归档逐个执行 单遍解析（briefing_ir）+ 紫色主题渲染，统计总耗时和吞吐
+2. 用合成简报把条目数从几条放大到上千条，检查每KB耗时是否保持不变（即耗时与文档大小成线性）
+
+用法: python3 scripts/bench_render.py [归档目录] [--rounds N]
+"""
+
+import os
+import sys
+import glob
+import time
+import argparse
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.dirname(SCRIPT_DIR)
+sys.path.insert(0, SCRIPT_DIR)
+
+import briefing_ir
+from md_to_purple_html import render_briefing
+
+# 合成简报用的各板块条目模板
+SAMPLE_SECTIONS = {
+    '1. 今日要闻': """### 【最高法】发布《关于审理案件的解释》第{n}号
+- **来源**: 最高人民法院
+- **时间**: 2026年09月01日
+- **链接**: https://www.court.gov.cn/a{n}.html
+- **摘要**: 最高人民法院发布司法解释，明确若干问题。
+- **实务影响**: 统一裁判尺度。
+""",
+    '2. 新规速递': """### 【法规】第{n}批规定
+**《数据安全条例》**
+- **发布机关**: 国务院
+- **主要内容**: 规范数据处理活动。
+
+**《网络安全法》修正**
+- **实务影响**: 加强监管。
+""",
+    '3. 典型案例': """### 【案例】张某诉李某合同纠纷案（{n}）
+**基本案情**: 张某与李某签订合同。
+- **来源**: 最高人民法院
+**裁判要点**: 合同有效。
+**典型意义**: 明确规则。
+""",
+    '4. 趋势洞察': """### 热点分析{n}
+- **数据合规**: 数据监管趋严
+**要点**: 加强合规审查
+""",
+    '5. 深度阅读': """### 法规全文{n}
+- [《数据安全条例》全文](https://example.com/{n})
+"""
+}
+
+def synthetic_briefing(items_per_section):
+    """生成每个板块含 items_per_section 条的简报Markdown"""
+    parts = ["# 2026年09月01日 法律简报\n\n**导语：** 基准测试。\n\n---\n"]
+    for name, template in SAMPLE_SECTIONS.items():
+        parts.append(f"\n## {name}\n\n")
+        parts.extend(template.format(n=n) + "\n" for n in range(items_per_section))
+        parts.append("---\n")
+    parts.append("\n*本简报由AI自动生成，仅供学习参考*\n")
+    return ''.join(parts)
+
+def time_rounds(func, rounds):
+    """重复执行并返回每轮平均耗时（毫秒）"""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        func()
+    return (time.perf_counter() - start) * 1000 / rounds
+
+def bench_archive(archive_dir, rounds):
+    files = sorted(glob.glob(os.path.join(archive_dir, '20*.md')))
+    if not files:
+        print(f"⚠️  归档为空: {archive_dir}")
+        return
+
+    contents = []
+    for path in files:
+        with open(path, 'r', encoding='utf-8') as f:
+            contents.append(f.read())
+    total_kb = sum(len(c.encode('utf-8')) for c in contents) / 1024
+
+    def parse_all():
+        return [briefing_ir.parse_markdown(c) for c in contents]
+
+    briefings = parse_all()
+
+    def render_all():
+        for b in briefings:
+            render_briefing(b, '2026-01-01', '2026年01月01日')
+
+    parse_ms = time_rounds(parse_all, rounds)
+    render_ms = time_rounds(render_all, rounds)
+
+    print(f"📚 归档 {len(files)} 份简报，共 {total_kb:.0f}KB，每轮 {rounds} 次")
+    print(f"   解析 {parse_ms:8.2f}ms  ({parse_ms * 1000 / len(files):.0f}µs/份，{parse_ms * 1000 / total_kb:.1f}µs/KB)")
+    print(f"   渲染 {render_ms:8.2f}ms  ({render_ms * 1000 / len(files):.0f}µs/份，{render_ms * 1000 / total_kb:.1f}µs/KB)")
+
+def bench_scaling(rounds):
+    print(f"\n📈 线性检查：合成简报（5个板块），每KB耗时应基本不变")
+    print("-" * 64)
+    print(f"{'每板块条目':>10}{'大小':>10}{'解析(ms)':>12}{'渲染(ms)':>12}{'µs/KB':>12}")
+
+    for count in (1, 10, 100, 1000, 5000):
+        content = synthetic_briefing(count)
+        kb = len(content.encode('utf-8')) / 1024
+        repeat = max(1, rounds * 10 // count)
+
+        briefing = briefing_ir.parse_markdown(content)
+        parse_ms = time_rounds(lambda: briefing_ir.parse_markdown(content), repeat)
+        render_ms = time_rounds(lambda: render_briefing(briefing, '2026-09-01', '2026年09月01日'), repeat)
+
+        print(f"{count:>10}{kb:>8.0f}KB{parse_ms:>12.2f}{render_ms:>12.2f}"
+              f"{(parse_ms + render_ms) * 1000 / kb:>12.1f}")
+
+def main():
+    parser = argparse.ArgumentParser(description='简报解析/渲染基准测试')
+    parser.add_argument('archive_dir', nargs='?', default=os.path.join(PROJECT_DIR, 'output', 'archive'))
+    parser.add_argument('--rounds', type=int, default=10)
+    args = parser.parse_args()
+
+    bench_archive(args.archive_dir, args.rounds)
+    bench_scaling(args.rounds)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,420 @@
+#!/usr/bin/env python3
+"""
+简报结构化中间表示（IR）
+Markdown只在这里单遍扫描解析一次，结果按 板块 → 条目 → 字段 保存为 <日期>.json（与 .md 同目录）；
+HTML渲染、归档索引、去重检查都读取IR，不再各自用正则重新解析Markdown
+"""
+
+import os
+import re
+import json
+import hashlib
+from dataclasses import dataclass, field, asdict
+
+# IR结构或解析规则变化时递增，旧的 .json 会被重新生成
+IR_VERSION = 3
+
+SECTION_KEYS = {
+    '1. 今日要闻': 'today',
+    '2. 新规速递': 'newrules',
+    '3. 典型案例': 'cases',
+    '4. 趋势洞察': 'trends',
+    '5. 深度阅读': 'reading'
+}
+
+DATE_PATTERN = re.compile(r'(\d{4}-\d{2}-\d{2})')
+LINK_PATTERN = re.compile(r'\-\s*\[(.+?)\]\((.+?)\)')
+
+@dataclass
+class Link:
+    text: str
+    url: str
+
+@dataclass
+class Field:
+    label: str
+    text: str
+
+@dataclass
+class Entry:
+    """条目下以 **标题** 开头的小节（新规速递、典型案例）"""
+    title: str
+    lines: list = field(default_factory=list)
+
+@dataclass
+class Item:
+    """一个 ### 条目"""
+    heading: str
+    tag: str = None
+    title: str = None
+    source: str = None
+    time: str = None
+    effective: str = None
+    link: str = None
+    summary: str = None
+    impact: str = None
+    entries: list = field(default_factory=list)
+    fields: list = field(default_factory=list)
+    links: list = field(default_factory=list)
+    lines: list = field(default_factory=list)
+
+@dataclass
+class Section:
+    """一个 ## 板块"""
+    title: str
+    key: str = None
+    lines: list = field(default_factory=list)
+    items: list = field(default_factory=list)
+
+@dataclass
+class Briefing:
+    date: str = None
+    title: str = None
+    intro: str = None
+    sections: list = field(default_factory=list)
+    footer: list = field(default_factory=list)
+    source_hash: str = None
+
+    def section(self, key):
+        """按板块key（today/newrules/...）查找板块"""
+        return next((s for s in self.sections if s.key == key), None)
+
+    def iter_items(self):
+        """按文档顺序遍历所有 ### 条目"""
+        for section in self.sections:
+            yield from section.items
+
+# 词法事件
+TITLE, SECTION, ITEM, RULE, BLANK, TEXT = 'title', 'section', 'item', 'rule', 'blank', 'text'
+
+def tokenize(content):
+    """单遍逐行扫描Markdown，产生 (事件, 行原文, 值)
+
+    事件：title（# 标题）、section（## 板块）、item（### 条目）、rule（---）、blank、text。
+    每行只做常数次前缀判断，总耗时与文档长度成正比。
+    """
+    in_section = False
+    title_seen = False
+
+    for line in content.split('\n'):
+        stripped = line.strip()
+        if line.startswith('## '):
+            in_section = True
+            yield SECTION, line, line[3:]
+        elif in_section and line.startswith('###') and line[3:4].isspace():
+            yield ITEM, line, stripped[3:].strip()
+        elif not (in_section or title_seen) and line.startswith('# ') and len(line) > 2:
+            title_seen = True
+            yield TITLE, line, line[2:].strip()
+        elif stripped == '---':
+            yield RULE, line, None
+        elif not stripped:
+            yield BLANK, line, None
+        else:
+            yield TEXT, line, None
+
+class _NewsCollector:
+    """### 【来源】标题 条目：来源、时间、链接、摘要、实务影响"""
+
+    def __init__(self, item, with_fields):
+        self.item = item
+        self.with_fields = with_fields
+        self.summary_lines = []
+        self.impact_lines = []
+
+        heading = item.heading
+        end = heading.find('】', 2)
+        title = heading[end + 1:].strip() if heading.startswith('【') and end > 0 else ''
+        # 】之后没有标题的不算新闻条目
+        self.done = not title
+        if title:
+            item.tag = heading[1:end]
+            item.title = title
+
+    def feed(self, line):
+        if self.done or not self.with_fields:
+            return
+
+        line = line.strip()
+        if not line:
+            return
+
+        item = self.item
+        if '- **来源**:' in line:
+            item.source = line.split('- **来源**:')[1].strip()
+        elif '- **发布时间**:' in line or '- **会议时间**:' in line or '- **时间**:' in line:
+            item.time = line.split(':**')[1].strip() if ':**' in line else line.split(':')[1].strip()
+        elif '- **链接**:' in line:
+            item.link = line.split('- **链接**:')[1].strip()
+        elif '- **生效时间**:' in line:
+            item.effective = line.split('- **生效时间**:')[1].strip()
+        elif '- **摘要**:' in line or '- **摘要**：' in line:
+            # 摘要内容在同一行，取标签后冒号（半角或全角）之后的内容
+            summary_content = _label_value(line)
+            if summary_content:
+                self.summary_lines.append(summary_content)
+        elif '- **实务影响**:' in line or '- **实务影响**：' in line:
+            impact_content = _label_value(line)
+            if impact_content:
+                self.impact_lines.append(impact_content)
+
+    def close(self):
+        if self.summary_lines:
+            self.item.summary = ' '.join(self.summary_lines).strip()
+        if self.impact_lines:
+            self.item.impact = ' '.join(self.impact_lines).strip()
+
+def _label_value(line):
+    """- **标签**: 内容 / - **标签**：内容 中标签之后的内容"""
+    rest = line.split('**', 2)[2] if line.count('**') >= 2 else ''
+    return rest[1:].strip() if rest[:1] in (':', '：') else rest.strip()
+
+class _RuleCollector:
+    """新规速递：以 **标题** 独占一行开始，到空行后的下一个 **标题** 行为止"""
+
+    def __init__(self, item):
+        self.item = item
+        self.title = None
+        self.lines = []
+
+    def feed(self, line):
+        title = _bold_title(line)
+        if self.title is not None:
+            if title is None or not self.lines or self.lines[-1].strip():
+                self.lines.append(line)
+                return
+            self._flush()
+
+        if title is not None:
+            self.title = title
+            self.lines = []
+
+    def _flush(self):
+        cleaned = (line.strip().lstrip('-').strip() for line in self.lines)
+        self.item.entries.append(Entry(self.title, [line for line in cleaned if line]))
+        self.title = None
+
+    def close(self):
+        if self.title is not None:
+            self._flush()
+
+def _bold_title(line):
+    """独占一行的 **标题**（至少一个字符）返回标题，否则返回None"""
+    line = line.strip()
+    if len(line) > 4 and line.startswith('**') and line.endswith('**'):
+        return line[2:-2].strip() or None
+    return None
+
+class _CaseCollector:
+    """典型案例：以 **小标题**: 开头的行开始一个小节"""
+
+    def __init__(self, item):
+        self.item = item
+        self.title = None
+        self.lines = []
+        self.first = True
+
+    def feed(self, line):
+        if not self.first and line.startswith('**'):
+            end = line.find('**:', 3)
+            if end >= 0:
+                self.close()
+                self.title = line[2:end]
+                self.lines = [line[end + 3:]]
+                return
+        self.first = False
+        if self.title is not None:
+            self.lines.append(line)
+
+    def close(self):
+        if self.title is not None:
+            lines = (line.strip() for line in '\n'.join(self.lines).strip().split('\n'))
+            self.item.entries.append(Entry(self.title.strip(), [line for line in lines if line]))
+            self.title = None
+
+class _TrendCollector:
+    """趋势洞察：**标签**: 内容（冒号后为空时内容在下一个非空行，之后再没有内容的标签忽略）"""
+
+    def __init__(self, item):
+        self.item = item
+        self.pending = None
+
+    def feed(self, line):
+        if self.pending is not None:
+            text = line.strip()
+            if text:
+                self.item.fields.append(Field(self.pending, text))
+                self.pending = None
+            return
+
+        start = line.find('**')
+        if start < 0:
+            return
+        end = line.find('**', start + 3)
+        if end < 0:
+            return
+
+        rest = line[end + 2:]
+        text = (rest[1:] if rest.startswith(':') else rest).strip()
+        if text:
+            self.item.fields.append(Field(line[start + 2:end], text))
+        else:
+            self.pending = line[start + 2:end]
+
+    def close(self):
+        self.pending = None
+
+class _ReadingCollector:
+    """深度阅读：- [标题](链接)"""
+
+    def __init__(self, item):
+        self.item = item
+
+    def feed(self, line):
+        if '](' in line:
+            self.item.links.extend(Link(text, url) for text, url in LINK_PATTERN.findall(line))
+
+    def close(self):
+        pass
+
+SECTION_COLLECTORS = {
+    'newrules': _RuleCollector,
+    'cases': _CaseCollector,
+    'trends': _TrendCollector,
+    'reading': _ReadingCollector
+}
+
+def parse_markdown(content, date=None):
+    """把一份Markdown简报解析为 Briefing（单遍扫描，由词法事件驱动各板块的收集器）"""
+    briefing = Briefing(date=date, source_hash=hashlib.sha256(content.encode('utf-8')).hexdigest())
+
+    section = None
+    owner = None          # 当前接收正文行的板块或条目
+    collectors = []
+    intro_lines = None    # 导语：从 **导语：** 到下一个以 --- 或 ## 开头的行
+    intro_done = False
+    footer = []           # 最后一条分隔线之后、且其后没有标题的行
+    footer_open = False
+
+    def close_item():
+        for collector in collectors:
+            collector.close()
+        collectors.clear()
+
+    for event, line, value in tokenize(content):
+        if not intro_done:
+            if intro_lines is not None:
+                if line.startswith('---') or line.startswith('##'):
+                    briefing.intro = '\n'.join(intro_lines).strip()
+                    intro_done = True
+                else:
+                    intro_lines.append(line)
+            elif '**导语：**' in line:
+                intro_lines = [line.split('**导语：**', 1)[1]]
+
+        if event == RULE:
+            footer, footer_open = [], True
+        elif line.lstrip().startswith('#'):
+            footer_open = False
+        elif footer_open and event != BLANK:
+            footer.append(line)
+
+        if event == TITLE:
+            if briefing.title is None:
+                briefing.title = value
+        elif event == SECTION:
+            close_item()
+            section = owner = Section(value, SECTION_KEYS.get(value))
+            briefing.sections.append(section)
+        elif event == ITEM:
+            close_item()
+            owner = Item(heading=value)
+            section.items.append(owner)
+            # 新规、案例等板块的条目也有【来源】标题，但字段行属于各自的小节
+            collector = SECTION_COLLECTORS.get(section.key)
+            collectors.append(_NewsCollector(owner, with_fields=collector is None))
+            if collector:
+                collectors.append(collector(owner))
+            for c in collectors[1:]:
+                c.feed(value)
+        elif owner is not None:
+            if event == TEXT:
+                owner.lines.append(line)
+            for collector in collectors:
+                collector.feed(line)
+
+    close_item()
+
+    # 页脚行不属于最后一个条目/板块
+    briefing.footer = footer if footer_open else []
+    if briefing.footer and owner is not None and owner.lines[-len(footer):] == footer:
+        del owner.lines[-len(footer):]
+
+    return briefing
+
+def to_dict(briefing):
+    return {'version': IR_VERSION, **asdict(briefing)}
+
+def from_dict(data):
+    """从JSON数据恢复 Briefing"""
+    sections = []
+    for s in data['sections']:
+        items = []
+        for i in s['items']:
+            items.append(Item(**{
+                **i,
+                'entries': [Entry(**e) for e in i['entries']],
+                'fields': [Field(**f) for f in i['fields']],
+                'links': [Link(**l) for l in i['links']]
+            }))
+        sections.append(Section(s['title'], s['key'], s['lines'], items))
+
+    return Briefing(
+        date=data['date'],
+        title=data['title'],
+        intro=data['intro'],
+        sections=sections,
+        footer=data['footer'],
+        source_hash=data['source_hash']
+    )
+
+def ir_path(md_file):
+    """IR文件路径：与Markdown同目录同名的 .json"""
+    return os.path.splitext(md_file)[0] + '.json'
+
+def save(briefing, path):
+    """原子写入IR文件"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(to_dict(briefing), f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+def load(md_file, write=True):
+    """读取Markdown对应的IR
+
+    .json 存在且版本和内容哈希都匹配时直接加载，否则解析Markdown并（write=True时）写回 .json。
+    """
+    with open(md_file, 'r', encoding='utf-8') as f:
+        content = f.read()
+
+    path = ir_path(md_file)
+    source_hash = hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') == IR_VERSION and data.get('source_hash') == source_hash:
+            return from_dict(data)
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    date_match = DATE_PATTERN.search(os.path.basename(md_file))
+    briefing = parse_markdown(content, date_match.group(1) if date_match else None)
+
+    if write:
+        try:
+            save(briefing, path)
+        except OSError as e:
+            print(f"⚠️  IR写入失败: {e}")
+
+    return briefing
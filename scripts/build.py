@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+增量构建
+构建清单（.cache/build_manifest.json）记录每个输出HTML的输入哈希：
+Markdown内容、模板版本、渲染代码版本和渲染选项。
+只重新渲染输入有变化、输出缺失或被改动过的页面，其余跳过并列出
+
+用法:
+    python3 scripts/build.py                  # 检查全部页面
+    python3 scripts/build.py --assets --index # 外链样式模式，并按需重建紫色主题首页
+    python3 scripts/build.py --force          # 忽略清单全部重建
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+from datetime import date, timedelta
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.dirname(SCRIPT_DIR)
+sys.path.insert(0, SCRIPT_DIR)
+
+import rebuild
+import page_template
+import output_layout
+import md_to_purple_html
+import generate_index
+from html_writer import open_output
+
+MANIFEST_PATH = os.getenv('BUILD_MANIFEST', os.path.join(PROJECT_DIR, '.cache', 'build_manifest.json'))
+
+# 清单格式变化时递增，旧清单整体作废
+MANIFEST_VERSION = 1
+
+# 影响页面输出的代码和模板
+PAGE_SOURCES = ('md_to_purple_html.py', 'briefing_ir.py', 'page_template.py', 'html_writer.py')
+PAGE_TEMPLATES = ('purple_page.html', 'purple.css', 'purple.js')
+
+# 影响首页输出的代码和模板（紫色主题首页，safe_push.sh / check_theme.sh 会检查）
+INDEX_SOURCES = ('generate_index.py', 'page_template.py', 'html_writer.py')
+INDEX_TEMPLATES = ('index_simple.html',)
+
+def file_hash(path):
+    """文件内容的sha256，文件不存在时返回None"""
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except FileNotFoundError:
+        return None
+
+def source_version(names):
+    """渲染代码版本：相关脚本源码的哈希"""
+    digest = hashlib.sha256()
+    for name in names:
+        digest.update(name.encode('utf-8') + b'\0')
+        digest.update((file_hash(os.path.join(SCRIPT_DIR, name)) or '').encode('ascii'))
+    return digest.hexdigest()[:16]
+
+def load_manifest(path=MANIFEST_PATH):
+    """读取构建清单 {输出路径: {'inputs': {...}, 'output': 哈希}}，不存在或版本不符时返回空清单"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+    if manifest.get('version') != MANIFEST_VERSION:
+        return {}
+    return manifest.get('outputs', {})
+
+def save_manifest(outputs, path=MANIFEST_PATH):
+    """原子写入构建清单"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'version': MANIFEST_VERSION, 'outputs': outputs}, f, ensure_ascii=False, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+def manifest_key(path):
+    """清单里的输出路径（相对项目目录）"""
+    return os.path.relpath(path, PROJECT_DIR).replace(os.sep, '/')
+
+def is_fresh(entry, inputs, output_path):
+    """清单记录的输入与当前一致，且输出文件未缺失、未被改动"""
+    return bool(entry) and entry.get('inputs') == inputs and entry.get('output') == file_hash(output_path)
+
+def date_ranges(dates):
+    """把排好序的日期压缩成连续区间描述，如 2026-01-24~2026-02-03"""
+    ranges = []
+    for value in dates:
+        day = date.fromisoformat(value)
+        if ranges and ranges[-1][1] + timedelta(days=1) == day:
+            ranges[-1][1] = day
+        else:
+            ranges.append([day, day])
+
+    return ', '.join(str(start) if start == end else f"{start}~{end}" for start, end in ranges)
+
+def build_pages(sources, manifest, output_dir=PROJECT_DIR, jobs=None, assets=None, force=False):
+    """只重建过期的页面，返回 (已重建日期, 跳过日期, 失败列表)，并就地更新 manifest"""
+    renderer = source_version(PAGE_SOURCES)
+    template = page_template.version(*PAGE_TEMPLATES)
+
+    stale, skipped, pending = [], [], {}
+    for day, md_file in sources:
+        output_path = os.path.join(output_dir, f"{day}.html")
+        inputs = {
+            'markdown': file_hash(md_file),
+            'template': template,
+            'renderer': renderer,
+            'assets': assets,
+        }
+        key = manifest_key(output_path)
+
+        if not force and is_fresh(manifest.get(key), inputs, output_path):
+            skipped.append(day)
+        else:
+            stale.append((day, md_file))
+            pending[key] = (day, output_path, inputs)
+
+    failures = rebuild.rebuild(stale, output_dir, jobs, assets)
+    failed = {manifest_key(path) for path, _ in failures}
+
+    built = []
+    for key, (day, output_path, inputs) in pending.items():
+        if key in failed:
+            manifest.pop(key, None)
+            continue
+        manifest[key] = {'inputs': inputs, 'output': file_hash(output_path)}
+        built.append(day)
+
+    return built, skipped, failures
+
+def build_index(manifest, output_dir=PROJECT_DIR, force=False):
+    """首页输入（页面列表、模板和代码）有变化时重建，返回是否重建"""
+    output_path = os.path.join(output_dir, 'index.html')
+    listing = generate_index.get_all_briefings(output_dir)
+    inputs = {
+        'pages': hashlib.sha256(json.dumps(listing).encode('utf-8')).hexdigest()[:16],
+        'template': page_template.version(*INDEX_TEMPLATES),
+        'renderer': source_version(INDEX_SOURCES),
+    }
+    key = manifest_key(output_path)
+
+    if not force and is_fresh(manifest.get(key), inputs, output_path):
+        return False
+
+    with open_output(output_path) as writer:
+        generate_index.generate_index_html(writer, output_dir)
+    manifest[key] = {'inputs': inputs, 'output': file_hash(output_path)}
+    return True
+
+def main():
+    parser = argparse.ArgumentParser(description='增量构建简报HTML页面')
+    parser.add_argument('dates', nargs='*', help='只检查这些日期（YYYY-MM-DD）')
+    parser.add_argument('--from', dest='start', help='起始日期（含）')
+    parser.add_argument('--to', dest='end', help='结束日期（含）')
+    parser.add_argument('--archive-dir', default=rebuild.ARCHIVE_DIR, help='Markdown归档目录')
+    parser.add_argument('--output-dir', default=PROJECT_DIR, help='HTML输出目录')
+    parser.add_argument('-j', '--jobs', type=int, default=None, help='工作进程数（默认CPU核数）')
+    parser.add_argument('--assets', action='store_true',
+                        help='样式/脚本引用共享的 assets/purple.<hash>.css/.js，不再内联')
+    parser.add_argument('--index', action='store_true', help='同时按需重建紫色主题首页（generate_index）')
+    parser.add_argument('--force', action='store_true', help='忽略构建清单，全部重建')
+    args = parser.parse_args()
+
+    sources = rebuild.select_sources(args.archive_dir, args.start, args.end, args.dates)
+    assets = md_to_purple_html.publish_assets(args.output_dir) if args.assets else None
+    manifest = load_manifest()
+
+    start = time.perf_counter()
+    built, skipped, failures = build_pages(sources, manifest, args.output_dir, args.jobs, assets, args.force)
+    # archive/ 和 output/archive/ 下只放由正本派生的副本
+    for day in built:
+        output_layout.link_mirrors(day, args.output_dir)
+    index_built = build_index(manifest, args.output_dir, args.force) if args.index else None
+    elapsed = time.perf_counter() - start
+
+    save_manifest(manifest)
+
+    for path, error in failures:
+        print(f"⚠️  {path}: {error}")
+    if built:
+        print(f"🔨 重建 {len(built)} 个页面: {date_ranges(built)}")
+    if skipped:
+        print(f"⏭️  跳过 {len(skipped)} 个未变化页面: {date_ranges(skipped)}")
+    if index_built is not None:
+        print("🔨 重建首页: index.html" if index_built else "⏭️  跳过未变化的首页: index.html")
+    print(f"✅ 构建完成，耗时 {elapsed:.2f}秒")
+
+    if failures:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+新闻详情页补全
+并发访问列表页条目的链接，提取正文、发布日期和文号；
+按主机限制并发数，结果完成一条返回一条
+"""
+
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError
+from urllib.parse import urlparse
+
+from http_session import get_session
+from html_parse import decode_html, make_soup
+
+# 总并发数、单个主机的并发上限、整个阶段的截止时间（秒）
+MAX_WORKERS = int(os.getenv('ENRICH_MAX_WORKERS', '8'))
+PER_HOST_LIMIT = int(os.getenv('ENRICH_PER_HOST', '2'))
+ENRICH_DEADLINE = float(os.getenv('ENRICH_DEADLINE', '20'))
+REQUEST_TIMEOUT = 10
+
+# 摘要截取长度
+SUMMARY_LENGTH = 120
+
+# 常见政府网站正文容器（按优先级）
+BODY_SELECTORS = [
+    'div.txt_txt',
+    'div.TRS_Editor',
+    'div#zoom',
+    'div.detail',
+    'div.article',
+    'div.content',
+    'article'
+]
+
+# 发布日期所在的元素（按优先级）：页面元信息、常见的发布时间栏
+DATE_SELECTORS = [
+    'meta[name="PubDate"]',
+    'meta[name="publishdate"]',
+    'meta[property="article:published_time"]',
+    '.pubtime',
+    '.pub_time',
+    '.publish-time',
+    '.time',
+    '.date',
+    '.message'
+]
+
+DATE_PATTERN = re.compile(r'(20\d{2})\s*[-年/.]\s*(\d{1,2})\s*[-月/.]\s*(\d{1,2})')
+# 文号，如：法释〔2026〕1号、高检发办字〔2026〕12号
+DOC_NUMBER_PATTERN = re.compile(r'[\u4e00-\u9fa5]{1,10}\s*[〔\[［（(]\s*\d{4}\s*[〕\]］）)]\s*第?\s*\d+\s*号')
+
+def extract_article(html):
+    """从详情页HTML中提取正文、发布日期和文号
+
+    没有任何正文选择器命中时正文为None：整页文字混着导航和页脚，不能当正文或摘要。
+    发布日期只从日期元素或正文中找，页头导航里的当天日期不算。
+    """
+    soup = make_soup(html)
+
+    for tag in soup(['script', 'style']):
+        tag.decompose()
+
+    body = None
+    for selector in BODY_SELECTORS:
+        body_elem = soup.select_one(selector)
+        if body_elem and body_elem.get_text(strip=True):
+            body = body_elem.get_text('\n', strip=True)
+            break
+
+    page_text = soup.get_text(' ', strip=True)
+
+    publish_date = None
+    date_match = None
+    for selector in DATE_SELECTORS:
+        for date_elem in soup.select(selector):
+            date_match = DATE_PATTERN.search(date_elem.get('content') or date_elem.get_text(' ', strip=True))
+            if date_match:
+                break
+        if date_match:
+            break
+    if not date_match and body:
+        date_match = DATE_PATTERN.search(body)
+    if date_match:
+        year, month, day = date_match.groups()
+        publish_date = f"{year}年{int(month):02d}月{int(day):02d}日"
+
+    doc_match = DOC_NUMBER_PATTERN.search(body or '') or DOC_NUMBER_PATTERN.search(page_text)
+    doc_number = re.sub(r'\s+', '', doc_match.group(0)) if doc_match else None
+
+    return {
+        'body': body,
+        'publish_date': publish_date,
+        'doc_number': doc_number
+    }
+
+def enrich_item(item, host_limits, timeout=REQUEST_TIMEOUT):
+    """访问单条新闻的详情页并补全字段（失败时原样返回）"""
+    url = item.get('url', '')
+    host = urlparse(url).netloc
+
+    try:
+        with host_limits[host]:
+            response = get_session().get(url, timeout=timeout)
+
+        if response.status_code != 200:
+            return item
+
+        article = extract_article(decode_html(response))
+
+    except Exception as e:
+        print(f"  ⚠️  详情页获取失败: {url} ({e})")
+        return item
+
+    enriched = dict(item)
+    if article['body']:
+        enriched['body'] = article['body']
+        enriched.setdefault('summary', ' '.join(article['body'].split())[:SUMMARY_LENGTH])
+    if article['publish_date']:
+        enriched['date'] = article['publish_date']
+    if article['doc_number']:
+        enriched['doc_number'] = article['doc_number']
+
+    return enriched
+
+def iter_enriched(items, max_workers=MAX_WORKERS, per_host=PER_HOST_LIMIT, deadline=ENRICH_DEADLINE):
+    """并发补全详情页，按完成顺序产出 (序号, 条目)
+
+    只处理带有效链接的条目；截止时间到达时未完成的条目以原样产出。
+    """
+    pending = {i: item for i, item in enumerate(items) if item.get('url', '').startswith('http')}
+
+    for i, item in enumerate(items):
+        if i not in pending:
+            yield i, item
+
+    if not pending:
+        return
+
+    # 每个主机一个信号量，限制对同一网站的并发访问
+    hosts = {urlparse(item['url']).netloc for item in pending.values()}
+    host_limits = {host: threading.BoundedSemaphore(per_host) for host in hosts}
+
+    executor = ThreadPoolExecutor(max_workers=min(max_workers, len(pending)))
+    futures = {executor.submit(enrich_item, item, host_limits): i for i, item in pending.items()}
+
+    try:
+        for future in as_completed(futures, timeout=deadline):
+            i = futures[future]
+            yield i, future.result()
+            del pending[i]
+    except TimeoutError:
+        print(f"⏱️  详情页补全超过截止时间 {deadline:.0f}s，{len(pending)} 条保持原样")
+        for i, item in pending.items():
+            yield i, item
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+def enrich_items(items, **kwargs):
+    """并发补全所有条目，按原顺序返回"""
+    results = list(items)
+    count = 0
+
+    for i, item in iter_enriched(items, **kwargs):
+        results[i] = item
+        if 'body' in item:
+            count += 1
+            print(f"  ✓ 已补全: {item['title'][:30]}...")
+
+    print(f"✅ 详情页补全：{count}/{len(items)} 条")
+    return results
@@ -6,180 +6,214 @@
 
 import os
 import sys
-import requests
+import argparse
 from datetime import datetime, timedelta
-from bs4 import BeautifulSoup
+from urllib.parse import urljoin
 import json
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import http_cache
+from http_session import DEFAULT_FIXTURE_DIR, configure_transport, get_session
+from enrich_news import enrich_items
+from html_parse import decode_html, parse_listing
 
 TODAY = datetime.now().strftime("%Y-%m-%d")
 DISPLAY_DATE = datetime.now().strftime("%Y年%m月%d日")
 
-def fetch_supreme_court_news():
-    """爬取最高人民法院新闻"""
-    try:
-        print("🔍 正在爬取最高人民法院新闻...")
-
-        # 官方新闻URL
-        url = "https://www.court.gov.cn/fabu-xiangqing.html"
-
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-        }
-
-        response = requests.get(url, headers=headers, timeout=10)
-        response.encoding = 'utf-8'
-
-        if response.status_code != 200:
-            print(f"⚠️  最高人民法院网站返回状态码: {response.status_code}")
-            return []
-
-        soup = BeautifulSoup(response.text, 'html.parser')
-
-        # 查找新闻列表
-        news_items = []
-
-        # 尝试不同的选择器
-        selectors = [
-            'div.news_list li',
-            'ul.news_list li',
-            'div.court-news-item',
-            'li.news-item',
-            'div[class*="news"] li',
-            'div.fabu-list li'
-        ]
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.dirname(SCRIPT_DIR)
+
+# 来源注册表（URL、选择器级联、基础URL、每个来源的条数上限）
+SOURCES_CONFIG = os.path.join(PROJECT_DIR, 'config', 'sources.json')
+
+# 所有来源共享的总截止时间（秒），可通过环境变量覆盖
+FETCH_DEADLINE = float(os.getenv('FETCH_DEADLINE', '20'))
+
+# 录制/回放跑出的是测试数据，默认写到这里（已被 .gitignore 忽略），不覆盖正式归档
+REPLAY_OUTPUT_DIR = os.path.join(PROJECT_DIR, '.cache', 'replay')
+
+def load_sources(config_file=None, include_disabled=False):
+    """读取来源注册表，将默认配置合并到每个来源"""
+    config_file = config_file or SOURCES_CONFIG
+
+    with open(config_file, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+
+    defaults = config.get('defaults', {})
+    sources = []
+    for entry in config.get('sources', []):
+        source = dict(defaults)
+        source.update(entry)
+        if not include_disabled and not source.get('enabled', True):
+            continue
+        sources.append(source)
+
+    return sources
+
+def get_source(source_id):
+    """按id查找来源配置（包括未启用的来源）"""
+    for source in load_sources(include_disabled=True):
+        if source['id'] == source_id:
+            return source
+    raise KeyError(f"未注册的来源: {source_id}")
+
+def extract_news_items(markup, source):
+    """按来源的选择器级联从页面中提取新闻条目"""
+    name = source['name']
+
+    selector, news_list = parse_listing(
+        markup,
+        source.get('selectors', []),
+        fallback_to_links=source.get('fallback_to_links', True)
+    )
+
+    if selector:
+        print(f"✅ {name}：找到{len(news_list)}条新闻（使用选择器: {selector}）")
+    elif news_list:
+        print(f"⚠️  {name}：未找到新闻列表，已提取所有链接")
+
+    news_items = []
+    for item in news_list[:source['max_candidates']]:
+        try:
+            # 提取标题（条目本身可能就是链接）
+            link_elem = item if item.name == 'a' else item.find('a')
+            title_elem = link_elem or item
+            title = title_elem.get_text(strip=True)
+
+            if len(title) < source['min_title_length']:  # 标题太短，跳过
+                continue
 
-        news_list = None
-        for selector in selectors:
-            news_list = soup.select(selector)
-            if news_list:
-                print(f"✅ 找到{len(news_list)}条新闻（使用选择器: {selector}）")
+            # 提取链接并补全为绝对地址
+            link = link_elem.get('href', '') if link_elem else ''
+            if link and not link.startswith('http'):
+                link = urljoin(source.get('base_url') or source['url'], link)
+
+            # 提取日期（如果有）
+            date_str = DISPLAY_DATE
+            if source.get('date_selector') and item.name != 'a':
+                date_elem = item.select_one(source['date_selector'])
+                if date_elem:
+                    date_str = date_elem.get_text(strip=True)
+
+            news_items.append({
+                'source': name,
+                'title': title[:100],  # 限制长度
+                'url': link,
+                'date': date_str,
+                'time': DISPLAY_DATE
+            })
+
+            print(f"  ✓ {title[:50]}...")
+
+            if len(news_items) >= source['max_items']:
                 break
 
-        if not news_list:
-            print("⚠️  未找到新闻列表，尝试提取所有链接...")
-            # 获取所有链接
-            links = soup.find_all('a', href=True)
-            news_list = links[:5]  # 取前5个
-
-        count = 0
-        for item in news_list[:5]:  # 最多取5条
-            try:
-                # 提取标题
-                title_elem = item.find('a') or item
-                title = title_elem.get_text(strip=True) if hasattr(title_elem, 'get_text') else str(item)
-
-                if len(title) < 10:  # 标题太短，跳过
-                    continue
+        except Exception as e:
+            continue
 
-                # 提取链接
-                link_elem = item.find('a')
-                link = link_elem.get('href', '') if link_elem else ''
+    return news_items
 
-                if link and not link.startswith('http'):
-                    base_url = "https://www.court.gov.cn/"
-                    link = base_url + link
+def fetch_source(source, deadline=None):
+    """爬取单个已注册来源（所有来源共用的通用爬取器）
 
-                # 提取日期（如果有）
-                date_elem = item.find('span', class_='date')
-                date_str = date_elem.get_text(strip=True) if date_elem else DISPLAY_DATE
+    列表页未变化（服务器返回304）时跳过解析，直接复用上次缓存的提取结果。
+    deadline为time.monotonic()下的截止时刻，请求超时不超过剩余时间。
+    """
+    name = source['name']
+    short_name = source.get('short_name', name)
+    url = source['url']
 
-                news_items.append({
-                    'source': '最高人民法院',
-                    'title': title[:100],  # 限制长度
-                    'url': link,
-                    'date': date_str,
-                    'time': DISPLAY_DATE
-                })
-
-                count += 1
-                print(f"  ✓ {title[:50]}...")
-
-                if count >= 3:  # 最多3条
-                    break
-
-            except Exception as e:
-                continue
-
-        print(f"✅ 最高法：爬取到 {count} 条新闻")
-        return news_items
-
-    except Exception as e:
-        print(f"❌ 最高法院爬取失败: {e}")
-        return []
-
-def fetch_spp_news():
-    """爬取最高人民检察院新闻"""
     try:
-        print("🔍 正在爬取最高人民检察院新闻...")
-
-        url = "https://www.spp.gov.cn/spp/zdgz/"
+        print(f"🔍 正在爬取{name}新闻...")
 
         headers = {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
+            'User-Agent': source['user_agent']
         }
 
-        response = requests.get(url, headers=headers, timeout=10)
-        response.encoding = 'utf-8'
+        # 仅当缓存的提取规则与当前一致时才发送条件请求
+        extractor = http_cache.extractor_signature(source)
+        entry = http_cache.load_entry(url)
+        if entry and entry.get('extractor') == extractor:
+            headers.update(http_cache.conditional_headers(entry))
+        else:
+            entry = None
+
+        timeout = source['timeout']
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                print(f"⏱️  {short_name}：已过总截止时间，未发起请求")
+                return []
+            timeout = min(timeout, remaining)
+
+        response = get_session().get(url, headers=headers, timeout=timeout)
+
+        if response.status_code == 304 and entry and entry.get('items') is not None:
+            http_cache.save_entry(url, http_cache.refresh_entry(entry, response))
+            news_items = [dict(item, time=DISPLAY_DATE) for item in entry['items']]
+            print(f"♻️  {short_name}：列表页未变化，复用缓存的 {len(news_items)} 条新闻")
+            return news_items
 
         if response.status_code != 200:
-            print(f"⚠️  最高检网站返回状态码: {response.status_code}")
+            print(f"⚠️  {name}网站返回状态码: {response.status_code}")
             return []
 
-        soup = BeautifulSoup(response.text, 'html.parser')
+        body = decode_html(response)
+        news_items = extract_news_items(body, source)
 
-        news_items = []
+        new_entry = http_cache.build_entry(response, body, news_items, extractor)
+        if new_entry:
+            http_cache.save_entry(url, new_entry)
 
-        # 查找新闻项
-        selectors = [
-            'div.news-list li',
-            'ul.news-list li',
-            'li.news-item',
-            'div[class*="news"]'
-        ]
+        print(f"✅ {short_name}：爬取到 {len(news_items)} 条新闻")
+        return news_items
 
-        news_list = None
-        for selector in selectors:
-            news_list = soup.select(selector)
-            if news_list:
-                print(f"✅ 找到{len(news_list)}条新闻（使用选择器: {selector}）")
-                break
+    except Exception as e:
+        print(f"❌ {short_name}爬取失败: {e}")
+        return []
 
-        if not news_list:
-            news_list = soup.find_all('a', href=True)[:5]
+def fetch_supreme_court_news():
+    """爬取最高人民法院新闻"""
+    return fetch_source(get_source('court'))
 
-        count = 0
-        for item in news_list[:5]:
-            try:
-                title_elem = item.find('a') if item.name != 'a' else item
-                title = title_elem.get_text(strip=True)[:100]
+def fetch_spp_news():
+    """爬取最高人民检察院新闻"""
+    return fetch_source(get_source('spp'))
 
-                if len(title) < 10:
-                    continue
+def fetch_all_sources(sources=None, deadline=None):
+    """并发爬取所有已注册来源
 
-                link = item.get('href', '')
+    所有来源同时开始，共用一个总截止时间；每个请求的超时都不超过剩余时间，
+    截止时仍未完成的来源被放弃，已完成来源的结果按注册顺序合并。总耗时取决于最慢的单个来源，而不是各来源之和。
+    """
+    sources = load_sources() if sources is None else sources
+    deadline = FETCH_DEADLINE if deadline is None else deadline
 
-                news_items.append({
-                    'source': '最高人民检察院',
-                    'title': title,
-                    'url': link,
-                    'date': DISPLAY_DATE,
-                    'time': DISPLAY_DATE
-                })
+    if not sources:
+        return []
 
-                count += 1
+    start = time.monotonic()
+    executor = ThreadPoolExecutor(max_workers=len(sources))
+    futures = [executor.submit(fetch_source, source, start + deadline) for source in sources]
 
-                if count >= 3:
-                    break
+    done, not_done = wait(futures, timeout=deadline)
 
-            except Exception as e:
-                continue
+    all_news = []
+    for source, future in zip(sources, futures):
+        if future not in done:
+            print(f"⏱️  {source['name']} 超过总截止时间 {deadline:.0f}s，已放弃")
+            continue
+        try:
+            all_news.extend(future.result())
+        except Exception as e:
+            print(f"❌ {source['name']} 执行失败: {e}")
 
-        print(f"✅ 最高检：爬取到 {count} 条新闻")
-        return news_items
+    # 不等待超时的来源：其请求超时已被截止时间封顶，线程很快会自行结束
+    executor.shutdown(wait=False, cancel_futures=True)
 
-    except Exception as e:
-        print(f"❌ 最高检爬取失败: {e}")
-        return []
+    print(f"⏱️  并发爬取完成：{len(done)}/{len(sources)} 个来源，耗时 {time.monotonic() - start:.1f}s")
+    return all_news
 
 def fetch_with_tavily():
     """使用Tavily搜索今日法律新闻"""
@@ -297,6 +331,42 @@ def get_fallback_real_news():
 
     return fallback_real_news
 
+def format_news_item(news):
+    """将单条新闻格式化为 ### 条目"""
+    content = f"""### 【{news['source']}】{news['title']}
+
+- **来源**: {news['source']}
+- **时间**: {news.get('date') or news.get('time', DISPLAY_DATE)}
+- **链接**: {news.get('url', '查看详情')}
+"""
+
+    if news.get('doc_number'):
+        content += f"- **文号**: {news['doc_number']}\n"
+    if news.get('summary'):
+        content += f"- **摘要**: {news['summary']}\n"
+
+    return content + "\n"
+
+def fetch_news_items(sources=None, enrich=True, min_items=3):
+    """爬取今日新闻，返回结构化条目列表（不写文件）
+
+    供其他脚本在进程内直接调用；官方网站条目不足min_items条时补充备选真实新闻。
+    """
+    # 1. 并发爬取各官方网站新闻
+    all_news = fetch_all_sources(sources)
+
+    # 2. 并发访问详情页，补全正文、发布日期和文号
+    if all_news and enrich:
+        print("📖 正在补全新闻详情...")
+        all_news = enrich_items(all_news)
+
+    # 3. 如果爬取失败，使用搜索
+    if len(all_news) < min_items:
+        print("⚠️  官方网站爬取失败或新闻不足，补充真实新闻标题...")
+        all_news.extend(get_fallback_real_news())
+
+    return all_news
+
 def format_news_to_markdown(news_items):
     """将新闻格式化为Markdown"""
     if not news_items:
@@ -313,13 +383,7 @@ def format_news_to_markdown(news_items):
 """
 
     for i, news in enumerate(news_items[:5], 1):
-        content += f"""### 【{news['source']}】{news['title']}
-
-- **来源**: {news['source']}
-- **时间**: {news.get('time', DISPLAY_DATE)}
-- **链接**: {news.get('url', '查看详情')}
-
-"""
+        content += format_news_item(news)
 
         if i < len(news_items):
             content += "\n"
@@ -332,39 +396,70 @@ def format_news_to_markdown(news_items):
 
     return content
 
-def main():
+def parse_args(argv=None):
+    """命令行参数"""
+    parser = argparse.ArgumentParser(description='爬取今日真实法律新闻')
+    parser.add_argument('--record', metavar='DIR', nargs='?', const=DEFAULT_FIXTURE_DIR,
+                        help='录制所有响应到fixture目录')
+    parser.add_argument('--replay', metavar='DIR', nargs='?', const=DEFAULT_FIXTURE_DIR,
+                        help='从fixture目录回放响应，不访问网络')
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='回放时每个请求的模拟延迟（毫秒）')
+    parser.add_argument('--fail-rate', type=float, default=0.0,
+                        help='回放时随机失败的概率（0-1）')
+    parser.add_argument('--seed', type=int, default=None,
+                        help='失败注入的随机种子')
+    parser.add_argument('--output', metavar='FILE', default=None,
+                        help=f'Markdown输出路径（默认 output/archive/{TODAY}.md；'
+                             f'录制/回放时默认 .cache/replay/{TODAY}.md）')
+    return parser.parse_args(argv)
+
+def main(argv=None):
     """主函数"""
+    args = parse_args(argv)
+    start = time.monotonic()
+
+    if args.record or args.replay:
+        # 录制/回放需要完整响应，不发送条件请求
+        http_cache.CACHE_ENABLED = False
+        configure_transport(
+            record_dir=args.record,
+            replay_dir=args.replay,
+            latency=args.latency / 1000,
+            fail_rate=args.fail_rate,
+            seed=args.seed
+        )
+
     print("=" * 60)
     print(f"📅 爬取 {DISPLAY_DATE} 真实法律新闻")
     print("=" * 60)
 
-    # 爬取各网站新闻
-    all_news = []
-
-    # 1. 最高人民法院
-    sc_news = fetch_supreme_court_news()
-    all_news.extend(sc_news)
-
-    # 2. 最高人民检察院
-    spp_news = fetch_spp_news()
-    all_news.extend(spp_news)
-
-    # 3. 如果爬取失败，使用搜索
-    if not all_news or len(all_news) < 3:
-        print("⚠️  官方网站爬取失败或新闻不足，补充真实新闻标题...")
-        fallback_news = get_fallback_real_news()
-        all_news.extend(fallback_news)
+    all_news = fetch_news_items()
 
     print()
     print(f"📊 总计获取 {len(all_news)} 条新闻")
 
+    if args.replay:
+        # 回放缺响应时结果会悄悄混入备选新闻，不可复现，直接失败
+        misses = get_session().get_adapter('https://').misses
+        if misses:
+            print(f"\n❌ 回放目录 {args.replay} 缺少 {len(misses)} 个录制的响应（先用 --record 录制）：")
+            for miss in misses:
+                print(f"   {miss}")
+            sys.exit(1)
+
     if all_news:
         # 格式化为Markdown
         content = format_news_to_markdown(all_news)
 
         # 保存
-        os.makedirs('output/archive', exist_ok=True)
-        output_file = f"output/archive/{TODAY}.md"
+        if args.output:
+            output_file = args.output
+        elif args.record or args.replay:
+            output_file = os.path.join(REPLAY_OUTPUT_DIR, f"{TODAY}.md")
+        else:
+            output_file = f"output/archive/{TODAY}.md"
+        os.makedirs(os.path.dirname(output_file) or '.', exist_ok=True)
 
         with open(output_file, 'w', encoding='utf-8') as f:
             f.write(content)
@@ -376,6 +471,7 @@ def main():
         print("-" * 60)
         print(content[:500] + "..." if len(content) > 500 else content)
         print("-" * 60)
+        print(f"⏱️  总耗时 {time.monotonic() - start:.2f}s")
 
         return output_file
     else:
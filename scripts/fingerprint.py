@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+新闻条目指纹
+标题归一化（去掉【来源】前缀、标点、日期、“第N批”等编号）和URL规范化后取哈希，
+用于在整个归档范围内O(1)判断单条新闻是否重复
+"""
+
+import re
+import hashlib
+from urllib.parse import urlsplit, parse_qsl, urlencode
+
+SOURCE_PREFIX_PATTERN = re.compile(r'^\s*【[^】]*】')
+DATE_PATTERN = re.compile(
+    r'\d{4}\s*年\s*\d{1,2}\s*月\s*\d{1,2}\s*日'
+    r'|\d{4}[-/.]\d{1,2}[-/.]\d{1,2}'
+    r'|\d{1,2}\s*月\s*\d{1,2}\s*日'
+)
+SEQUENCE_PATTERN = re.compile(r'第\s*[\d零〇一二三四五六七八九十百千两]+\s*[批期号次届个件]')
+NON_WORD_PATTERN = re.compile(r'[\W_]+')
+
+# 规范化URL时去掉的跟踪参数
+TRACKING_PARAMS = {'spm', 'from', 'share', 'source'}
+
+def normalize_title(title):
+    """标题归一化：去掉【来源】前缀、日期、“第N批”编号和所有标点空白"""
+    title = SOURCE_PREFIX_PATTERN.sub('', title)
+    title = DATE_PATTERN.sub('', title)
+    title = SEQUENCE_PATTERN.sub('', title)
+    return NON_WORD_PATTERN.sub('', title).lower()
+
+def canonicalize_url(url):
+    """URL规范化：忽略协议、www、默认端口、结尾斜杠、锚点和跟踪参数
+
+    只有站点首页（没有具体路径）的链接返回None，不作为去重依据。
+    """
+    parts = urlsplit(url.strip())
+    if not parts.netloc:
+        return None
+
+    host = parts.hostname or ''
+    if host.startswith('www.'):
+        host = host[4:]
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+
+    path = re.sub(r'/+', '/', parts.path)
+    path = re.sub(r'/index\.s?html?$', '/', path).rstrip('/')
+    if not path:
+        return None
+
+    query = urlencode(sorted(
+        (key, value) for key, value in parse_qsl(parts.query)
+        if not key.lower().startswith('utm_') and key.lower() not in TRACKING_PARAMS
+    ))
+
+    return f"{host}{path}" + (f"?{query}" if query else '')
+
+def _digest(kind, value):
+    return f"{kind}:" + hashlib.sha1(value.encode('utf-8')).hexdigest()[:16]
+
+def title_fingerprint(title):
+    """标题指纹（归一化后为空时返回None）"""
+    normalized = normalize_title(title)
+    return _digest('title', normalized) if normalized else None
+
+def url_fingerprint(url):
+    """URL指纹（首页或无效链接返回None）"""
+    canonical = canonicalize_url(url) if url else None
+    return _digest('url', canonical) if canonical else None
+
+def fingerprints(title, urls=()):
+    """一条新闻的标题指纹和各链接的URL指纹"""
+    candidates = [title_fingerprint(title)] + [url_fingerprint(url) for url in urls]
+    return list(dict.fromkeys(fp for fp in candidates if fp))
+
+def item_fingerprints(item):
+    """简报IR中一个条目的 (标题, [指纹])"""
+    urls = [item.link] + [link.url for link in item.links]
+    return item.heading, fingerprints(item.heading, urls)
@@ -5,10 +5,249 @@ AI生成简报
 """
 
 import os
-import requests
+import sys
 import json
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+import llm_cache
+from glm_client import chat_completion, remaining_budget, stream_chat_completion
+
+# 完整5板块简报大约需要的token（prompt + 输出）
+FULL_BRIEF_TOKENS = 5500
+
+# 流式生成的总时长上限（秒）
+STREAM_DEADLINE = float(os.getenv('GLM_STREAM_DEADLINE', '180'))
+
+# 生成中断时追加的结尾
+INTERRUPTED_FOOTER = "*本简报由AI自动生成（部分板块因生成中断未完成），仅供学习参考*\n"
+
+# 板块生成模式：每个板块单独的prompt（按优先级排列，预算不足时从末尾舍弃）
+# (板块标题, 内容要求, 输出格式, max_tokens)
+SECTION_SPECS = [
+    ('1. 今日要闻', """3-5条今日法律要闻，涵盖最高法、最高检、司法部等官方动态，
+每条包含来源、时间、摘要（80-120字）、实务影响""", """### 【来源】标题
+- **来源**: xxx
+- **时间**: {display_date}
+- **摘要**: xxx（80-120字）
+- **实务影响**: xxx""", 1200),
+    ('2. 新规速递', """2-3条最新法律法规或司法解释，
+每条包含发布机关、发布时间、生效时间、主要内容、实务影响""", """### 【标题】法规名称
+- **发布机关**: xxx
+- **发布时间**: xxx
+- **生效时间**: xxx
+- **主要内容**: xxx
+- **实务影响**: xxx""", 900),
+    ('3. 典型案例', """2-3条指导性案例或典型案例，提及具体案例名称和案号，
+每条包含来源、时间、基本案情、裁判要点、典型意义""", """### 【标题】案例名称
+- **来源**: xxx
+- **时间**: {display_date}
+- **基本案情**: xxx
+- **裁判要点**: xxx
+- **典型意义**: xxx""", 900),
+    ('4. 趋势洞察', """分析当前法律热点，并给出2-3条实务建议""", """**当前热点分析**：xxx
+
+**实务建议**：
+- 要点1：xxx
+- 要点2：xxx""", 600),
+    ('5. 深度阅读', """推荐延伸阅读：相关法规全文链接、司法解释解读、案例集锦""", """- [《xxx》全文](链接1)
+- [《xxx》解读](链接2)
+- [相关案例集](链接3)""", 400),
+]
+
+INTRO_MAX_TOKENS = 200
+
+# 单个板块失败后（重试引擎已重试过）再单独重新生成的轮数
+SECTION_RETRY_ROUNDS = 1
+
+def build_section_prompt(section_name, requirement, output_format, display_date):
+    """单个板块的prompt"""
+    return f"""请为{display_date}的法律简报撰写“{section_name[3:]}”板块。
+
+**内容要求**：
+{requirement}
+
+**输出格式**（只输出本板块，以“## {section_name}”开头，不要输出其他板块、导语或结尾）：
+## {section_name}
+
+{output_format.format(display_date=display_date)}
+"""
+
+def build_intro_prompt(display_date):
+    """导语的prompt"""
+    return f"""请为{display_date}的法律简报写一段导语（2-3句话总结当日法律动态），
+只输出导语正文，不要标题和其他内容。"""
+
+def normalize_section(section_name, text):
+    """整理单个板块的输出：保证以板块标题开头，去掉多余的分隔线"""
+    text = text.strip()
+    heading = f"## {section_name}"
+
+    if heading in text:
+        text = text[text.index(heading):]
+    else:
+        text = f"{heading}\n\n{text}"
+
+    while text.endswith('---'):
+        text = text[:-3].rstrip()
+
+    return text
+
+def merge_sections(display_date, intro, sections):
+    """按固定板块顺序合并为标准Markdown简报"""
+    parts = [f"""# {display_date} 法律简报
+
+**导语：** {intro or '今日法律界最新资讯更新。'}
+"""]
+
+    for section_name, _, _, _ in SECTION_SPECS:
+        if sections.get(section_name):
+            parts.append(sections[section_name] + "\n")
+
+    parts.append("*本简报由AI自动生成，仅供学习参考*\n")
+    return "\n---\n\n".join(parts)
+
+def generate_sections(api_key, display_date):
+    """并发生成导语和各板块，失败的板块单独重新生成
+
+    返回合并后的Markdown；今日要闻生成失败时返回None。
+    """
+    # 按剩余预算决定生成哪些板块
+    budget = remaining_budget() - INTRO_MAX_TOKENS
+    specs = []
+    for spec in SECTION_SPECS:
+        budget -= spec[3] + len(build_section_prompt(spec[0], spec[1], spec[2], display_date))
+        if budget < 0:
+            print(f"💰 token预算不足，舍弃板块及之后: {spec[0]}")
+            break
+        specs.append(spec)
+
+    if not specs:
+        return None
+
+    def generate_one(spec):
+        section_name, requirement, output_format, max_tokens = spec
+        prompt = build_section_prompt(section_name, requirement, output_format, display_date)
+        text = chat_completion(api_key, prompt, temperature=0.7, max_tokens=max_tokens,
+                               purpose=f'section:{section_name}')
+        return normalize_section(section_name, text)
+
+    def generate_intro():
+        return chat_completion(api_key, build_intro_prompt(display_date), temperature=0.7,
+                               max_tokens=INTRO_MAX_TOKENS, purpose='section:intro').strip()
+
+    start = time.monotonic()
+    sections = {}
+    intro = None
+
+    with ThreadPoolExecutor(max_workers=len(specs) + 1) as executor:
+        intro_future = executor.submit(generate_intro)
+        pending = specs
+
+        for round_number in range(SECTION_RETRY_ROUNDS + 1):
+            futures = {executor.submit(generate_one, spec): spec for spec in pending}
+            failed = []
+
+            for future, spec in futures.items():
+                try:
+                    sections[spec[0]] = future.result()
+                    print(f"  ✓ {spec[0]}（{time.monotonic() - start:.1f}s）")
+                except Exception as e:
+                    print(f"  ⚠️  {spec[0]} 生成失败: {e}")
+                    failed.append(spec)
+
+            if not failed or round_number == SECTION_RETRY_ROUNDS:
+                break
+            print(f"🔄 重新生成失败的 {len(failed)} 个板块...")
+            pending = failed
+
+        try:
+            intro = intro_future.result()
+        except Exception as e:
+            print(f"  ⚠️  导语生成失败: {e}")
+
+    if SECTION_SPECS[0][0] not in sections:
+        return None
+
+    return merge_sections(display_date, intro, sections)
+
+def generate_brief_by_sections():
+    """板块生成模式：各板块并发生成后合并"""
+
+    api_key = os.getenv('GLM_API_KEY')
+    if not api_key:
+        print("⚠️  GLM_API_KEY未设置，使用模板生成")
+        return generate_template_brief()
+
+    today = datetime.now().strftime("%Y-%m-%d")
+    display_date = datetime.now().strftime("%Y年%m月%d日")
+
+    print(f"🤖 按板块并发生成 {display_date} 简报...")
+    content = generate_sections(api_key, display_date)
+
+    if not content:
+        print("⚠️  今日要闻生成失败，使用模板生成")
+        return generate_template_brief()
+
+    os.makedirs('output/archive', exist_ok=True)
+    output_file = f'output/archive/{today}.md'
+
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write(content)
+
+    print(f"✅ AI简报已生成: {output_file}")
+    return output_file
+
+def write_sections_incrementally(chunks, output_file, deadline=STREAM_DEADLINE):
+    """边接收边写入：每个板块（## 标题到下一个 ## 之前）完整到达后立即追加到文件
+
+    生成中断或超时时保留已写入的板块并追加结尾；一个板块都没写入时向上抛出异常。
+    返回写入的板块数。
+    """
+    os.makedirs(os.path.dirname(output_file) or '.', exist_ok=True)
+    start = time.monotonic()
+    buffer = ''
+    sections = []
+    tail = ''
+
+    with open(output_file, 'w', encoding='utf-8') as f:
+
+        def flush(text):
+            nonlocal tail
+            tail = text
+            f.write(text)
+            f.flush()
+            for line in text.split('\n'):
+                if line.startswith('## '):
+                    sections.append(line[3:])
+                    print(f"  ✓ {line[3:]}（{time.monotonic() - start:.1f}s）")
+
+        try:
+            for text in chunks:
+                buffer += text
+
+                # 最后一个板块标题之前的内容都已完整
+                boundary = buffer.rfind('\n## ')
+                if boundary > 0:
+                    flush(buffer[:boundary + 1])
+                    buffer = buffer[boundary + 1:]
+
+                if time.monotonic() - start > deadline:
+                    raise TimeoutError(f"流式生成超过 {deadline:.0f}s")
+
+            flush(buffer)
+
+        except Exception as e:
+            if not sections:
+                raise
+            print(f"⚠️  生成中断（{e}），保留已完成的 {len(sections)} 个板块")
+            if not tail.rstrip().endswith('---'):
+                f.write("\n---\n\n")
+            f.write(INTERRUPTED_FOOTER)
+
+    return len(sections)
+
 def generate_brief():
     """使用GLM API生成简报"""
 
@@ -21,13 +260,13 @@ def generate_brief():
     today = datetime.now().strftime("%Y-%m-%d")
     display_date = datetime.now().strftime("%Y年%m月%d日")
 
+    budget = remaining_budget()
+    if budget < FULL_BRIEF_TOKENS:
+        print(f"💰 今日token预算仅剩 {budget}，不足以生成完整简报，使用模板生成")
+        return generate_template_brief()
+
     # 调用GLM API
     try:
-        headers = {
-            "Authorization": f"Bearer {api_key}",
-            "Content-Type": "application/json"
-        }
-
         prompt = f"""请生成一份{display_date}的法律简报。
 
 **要求结构完整，必须包含以下5个板块**：
@@ -116,38 +355,14 @@ def generate_brief():
 *本简报由AI自动生成，仅供学习参考*
 """
 
-        data = {
-            "model": "glm-4.7",
-            "messages": [
-                {"role": "user", "content": prompt}
-            ],
-            "temperature": 0.7,
-            "max_tokens": 4000
-        }
-
-        response = requests.post(
-            "https://open.bigmodel.cn/api/paas/v4/chat/completions",
-            headers=headers,
-            json=data,
-            timeout=30
-        )
-
-        if response.status_code == 200:
-            result = response.json()
-            content = result['choices'][0]['message']['content']
-
-            # 保存简报
-            os.makedirs('output/archive', exist_ok=True)
-            output_file = f'output/archive/{today}.md'
-
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(content)
-
-            print(f"✅ AI简报已生成: {output_file}")
-            return output_file
-        else:
-            print(f"⚠️  GLM API调用失败: {response.status_code}")
-            return generate_template_brief()
+        # 流式接收，完整的板块先写入文件
+        output_file = f'output/archive/{today}.md'
+        chunks = stream_chat_completion(api_key, prompt, temperature=0.7, max_tokens=4000,
+                                        purpose='generate_brief')
+        sections = write_sections_incrementally(chunks, output_file)
+
+        print(f"✅ AI简报已生成: {output_file}（{sections} 个板块）")
+        return output_file
 
     except Exception as e:
         print(f"⚠️  GLM API调用异常: {e}")
@@ -204,4 +419,12 @@ def generate_template_brief():
     return output_file
 
 if __name__ == '__main__':
-    generate_brief()
+    # --refresh：忽略已缓存的GLM响应，强制重新生成
+    if '--refresh' in sys.argv[1:]:
+        llm_cache.set_refresh()
+
+    # --sections 或 GLM_SECTION_MODE=true 时按板块并发生成
+    if '--sections' in sys.argv[1:] or os.getenv('GLM_SECTION_MODE', '').lower() == 'true':
+        generate_brief_by_sections()
+    else:
+        generate_brief()
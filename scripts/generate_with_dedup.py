@@ -3,26 +3,44 @@
 每日法律简报生成器 - 包含内容去重机制
 1. 先生成本地预览
 2. 对比历史简报避免重复
-3. 如果重复则自动选择其他新闻
+3. 逐条剔除重复新闻并用其他新闻补足；整体相似度过高时改用备选内容
 """
 
 import os
 import sys
 import json
-import glob
 import re
-import subprocess
+from collections import Counter
 from datetime import datetime, timedelta
-from difflib import SequenceMatcher
 
 # 配置
 HISTORY_DIR = "output/archive"
 PREVIEW_DIR = "preview"
 
+# 与历史简报的相似度阈值，及最多报告的相似简报数
+SIMILARITY_THRESHOLD = 0.7
+MAX_SIMILARITY_ISSUES = 3
+
+# 逐条语义查重的打分后端（tfidf/off）及阈值：改写过的模板标题指纹对不上，靠它识别
+SEMANTIC_BACKEND = os.getenv('DEDUP_SEMANTIC_BACKEND', 'tfidf').lower()
+SEMANTIC_THRESHOLD = float(os.getenv('DEDUP_SEMANTIC_THRESHOLD', '0.7'))
+
+# 剔除重复条目后，每个新闻板块少于该条数（原本就不足的按原条数）时，从备选新闻中补足
+MIN_NEWS_ITEMS = 3
+
 # 添加脚本目录到路径
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, SCRIPT_DIR)
 
+import archive_index
+import briefing_ir
+import fetch_real_news
+import fingerprint
+import llm_cache
+import near_dup
+import semantic_sim
+from glm_client import chat_completion, load_glm_config
+
 # 支持通过环境变量或命令行参数指定日期
 date_override = os.getenv('TODAY')
 if date_override:
@@ -34,100 +52,241 @@ TODAY = target_date.strftime("%Y-%m-%d")
 DISPLAY_DATE = target_date.strftime("%Y年%m月%d日")
 
 def get_history_briefings():
-    """获取历史简报列表"""
-    md_files = sorted(glob.glob(f"{HISTORY_DIR}/*.md"), reverse=True)
+    """获取历史简报列表（从归档索引读取，只重新解析有变化的文件）"""
     briefings = []
 
-    for md_file in md_files[:7]:  # 只看最近7天
-        try:
-            with open(md_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-                # 提取关键信息
-                headlines = re.findall(r'### 【(.+?)】(.+)', content)
-                briefings.append({
-                    'file': md_file,
-                    'date': os.path.basename(md_file).replace('.md', ''),
-                    'headlines': headlines,
-                    'content': content
-                })
-        except:
-            continue
+    # 只看今天之前的最近7天：重跑同一天时不会把当天已发布的标题算进去，提示词保持不变（可命中LLM缓存）
+    for entry in archive_index.list_briefings(limit=7, before=TODAY, archive_dir=HISTORY_DIR):
+        briefings.append({
+            'file': os.path.join(HISTORY_DIR, entry['filename']),
+            'date': entry['date'],
+            'headlines': entry['headlines']
+        })
 
     return briefings
 
-def calculate_similarity(text1, text2):
-    """计算文本相似度"""
-    return SequenceMatcher(None, text1, text2).ratio()
+def find_duplicate_items(briefing, known=None):
+    """按标题/URL指纹查找与整个归档（或本篇前文）重复的新闻条目"""
+    if known is None:
+        known = archive_index.load_fingerprints(exclude_date=TODAY, archive_dir=HISTORY_DIR)
+
+    duplicates = []
+    current = {}
+    for index, item in enumerate(briefing.iter_items()):
+        title, fingerprints = fingerprint.item_fingerprints(item)
+        hit = next((known.get(fp) or current.get(fp) for fp in fingerprints
+                    if fp in known or fp in current), None)
+        if hit:
+            duplicates.append({
+                'type': 'title_duplicate',
+                'date': hit[0],
+                'title': title,
+                'item': index
+            })
+            continue
+        for fp in fingerprints:
+            current[fp] = (TODAY, title)
+
+    return duplicates
+
+def score_tfidf(titles):
+    """TF-IDF后端：新标题与归档全部历史标题一次性打分"""
+    history = archive_index.load_item_titles(exclude_date=TODAY, archive_dir=HISTORY_DIR)
+    index = semantic_sim.TfidfIndex.cached([title for title, _ in history], keys=history)
+    return index.best_matches(titles, threshold=SEMANTIC_THRESHOLD)
+
+# 语义打分后端：输入新标题列表，返回每条的 ((历史标题, 日期), 相似度) 或 None
+SCORING_BACKENDS = {
+    'tfidf': score_tfidf,
+}
+
+def find_semantic_duplicates(briefing, skip=()):
+    """用语义打分后端查找改写过措辞的重复条目（skip: 已判定重复的条目序号）"""
+    scorer = SCORING_BACKENDS.get(SEMANTIC_BACKEND)
+    if not scorer:
+        return []
+
+    candidates = [(index, item.heading)
+                  for index, item in enumerate(briefing.iter_items())
+                  if index not in skip]
+    if not candidates:
+        return []
 
-def check_content_dedup(new_content, history_briefings):
-    """检查内容是否与历史重复"""
     issues = []
+    for (index, title), match in zip(candidates, scorer([title for _, title in candidates])):
+        if match:
+            (hist_title, date), score = match
+            issues.append({
+                'type': 'semantic_duplicate',
+                'date': date,
+                'title': title,
+                'similar_title': hist_title,
+                'similarity': f"{score*100:.1f}%",
+                'item': index
+            })
 
-    # 提取新内容的关键信息
-    new_headlines = re.findall(r'### 【(.+?)】(.+)', new_content)
-    new_paragraphs = re.findall(r'\*\*摘要\*\*:(.+?)(?=\n-|$)', new_content, re.DOTALL)
+    return issues
 
-    for hist in history_briefings:
-        # 检查标题重复
-        for new_source, new_title in new_headlines:
-            for hist_source, hist_title in hist['headlines']:
-                if new_title.strip() == hist_title.strip():
-                    issues.append({
-                        'type': 'title_duplicate',
-                        'date': hist['date'],
-                        'title': new_title,
-                        'source': new_source
-                    })
-
-        # 检查内容相似度
-        similarity = calculate_similarity(new_content, hist['content'])
-        if similarity > 0.7:  # 相似度超过70%
+def find_near_duplicate_items(briefing, skip=()):
+    """用MinHash在整个归档中查找正文近似重复的条目（skip: 已判定重复的条目序号）"""
+    candidates = [(index, item)
+                  for index, item in enumerate(briefing.iter_items())
+                  if index not in skip]
+    if not candidates:
+        return []
+
+    texts = ['\n'.join([f"### {item.heading}"] + item.lines) for _, item in candidates]
+    matches = archive_index.find_near_duplicate_items(
+        texts,
+        threshold=SIMILARITY_THRESHOLD,
+        exclude_date=TODAY,
+        archive_dir=HISTORY_DIR
+    )
+
+    issues = []
+    for (index, item), similar in zip(candidates, matches):
+        if similar:
+            key, date, score = similar[0]
             issues.append({
-                'type': 'high_similarity',
-                'date': hist['date'],
-                'similarity': f"{similarity*100:.1f}%"
+                'type': 'item_similarity',
+                'date': date,
+                'title': item.heading,
+                'similarity': f"{score*100:.1f}%",
+                'item': index
             })
 
     return issues
 
+def check_content_dedup(new_content):
+    """检查内容是否与历史重复"""
+    briefing = briefing_ir.parse_markdown(new_content, TODAY)
+
+    # 逐条检查标题/URL是否已在归档中出现过
+    issues = find_duplicate_items(briefing)
+
+    # 指纹没命中的条目再做语义打分
+    issues.extend(find_semantic_duplicates(briefing, skip={issue['item'] for issue in issues}))
+
+    # 标题不像但正文几乎照搬的条目，用单条新闻的MinHash签名查
+    issues.extend(find_near_duplicate_items(briefing, skip={issue['item'] for issue in issues}))
+
+    # 检查内容相似度（LSH查询覆盖整个归档，只比较同桶候选）
+    similar = archive_index.find_near_duplicates(
+        new_content,
+        threshold=SIMILARITY_THRESHOLD,
+        exclude_date=TODAY,
+        archive_dir=HISTORY_DIR
+    )
+    for key, date, similarity in similar[:MAX_SIMILARITY_ISSUES]:
+        issues.append({
+            'type': 'high_similarity',
+            'date': date,
+            'similarity': f"{similarity*100:.1f}%"
+        })
+
+    return issues
+
+def format_news_item(news):
+    """把一条备选新闻格式化为 ### 条目"""
+    return f"""### 【{news['source']}】{news['title']}
+
+- **来源**: {news['source']}
+- **时间**: {news['time']}
+- **摘要**: {news['summary']}
+- **实务影响**: {news['impact']}
+
+"""
+
+def insert_items(content, items, section_title=None):
+    """把条目追加到指定板块（默认“今日要闻”）末尾，找不到该板块时追加到第一个板块"""
+    pattern = rf'^## {re.escape(section_title)}\s*$' if section_title else r'^## .*今日要闻.*$'
+    section = re.search(pattern, content, re.M) or re.search(r'^## .+$', content, re.M)
+    if not section:
+        return content.rstrip('\n') + '\n\n' + ''.join(items)
+
+    end = re.compile(r'^(?:## |---)', re.M).search(content, section.end())
+    pos = end.start() if end else len(content)
+    head = content[:pos].rstrip('\n') + '\n\n'
+    return head + ''.join(items) + content[pos:]
+
+def replace_duplicate_items(content, duplicates):
+    """只剔除重复的新闻条目，再用未出现过的备选新闻补足
+
+    条数下限按板块计算：每个含新闻条目的板块剔除后不少于 min(MIN_NEWS_ITEMS, 原条数)，
+    不会因为其他板块条目多而被剔空。
+    """
+    original = [(section.title, len(section.items))
+                for section in briefing_ir.parse_markdown(content, TODAY).sections if section.items]
+
+    # 同一标题可能在本篇中出现多次（后出现的才是重复），所以按标题计数、从后往前剔除
+    pending = Counter(issue['title'] for issue in duplicates)
+    for match in reversed(list(near_dup.ITEM_PATTERN.finditer(content))):
+        heading = match.group().split('\n', 1)[0][4:].strip()
+        if pending[heading]:
+            pending[heading] -= 1
+            content = content[:match.start()] + content[match.end():]
+    print(f"🗑️  已剔除 {len(duplicates)} 条重复新闻")
+
+    briefing = briefing_ir.parse_markdown(content, TODAY)
+    remaining = {section.title: len(section.items) for section in briefing.sections}
+    missing = [(title, min(MIN_NEWS_ITEMS, count) - remaining.get(title, 0)) for title, count in original]
+    missing = [(title, count) for title, count in missing if count > 0]
+    if not missing:
+        return content
+
+    fallback = fetch_fallback_news()
+    if isinstance(fallback, dict) and fallback.get('fetched'):
+        candidates = [(news, fetch_real_news.format_news_item) for news in fallback['items']]
+    else:
+        candidates = [(news, format_news_item) for news in fallback]
+
+    # 备选条目同样要避开归档和本篇已有的新闻
+    known = archive_index.load_fingerprints(exclude_date=TODAY, archive_dir=HISTORY_DIR)
+    for item in briefing.iter_items():
+        known.update(dict.fromkeys(fingerprint.item_fingerprints(item)[1], (TODAY, '')))
+
+    total = sum(count for _, count in missing)
+    replacements = []
+    for news, format_item in candidates:
+        fingerprints = fingerprint.fingerprints(f"【{news['source']}】{news['title']}", [news.get('url')])
+        if any(fp in known for fp in fingerprints):
+            continue
+        known.update(dict.fromkeys(fingerprints, (TODAY, '')))
+        item = format_item(news)
+        replacements.append(item if item.endswith('\n\n') else item.rstrip('\n') + '\n\n')
+        if len(replacements) == total:
+            break
+
+    if replacements:
+        # 按板块顺序依次补足
+        start = 0
+        for title, count in missing:
+            if start < len(replacements):
+                content = insert_items(content, replacements[start:start + count], title)
+            start += count
+        print(f"➕ 已补充 {len(replacements)} 条备选新闻")
+    else:
+        print("⚠️  没有可用的非重复备选新闻")
+
+    return content
+
 def fetch_fallback_news():
     """获取真实法律新闻，优先爬取而非使用模板"""
 
     print("📡 API调用失败，尝试爬取真实法律新闻...")
 
-    # 尝试调用fetch_real_news.py爬取真实新闻
+    # 在进程内直接调用爬取流程，拿到结构化条目
     try:
-        fetch_script = os.path.join(SCRIPT_DIR, 'fetch_real_news.py')
-
-        if os.path.exists(fetch_script):
-            # 使用subprocess运行fetch_real_news.py
-            result = subprocess.run(
-                [sys.executable, fetch_script],
-                capture_output=True,
-                text=True,
-                timeout=60,
-                cwd=SCRIPT_DIR
-            )
-
-            # 检查是否成功生成了Markdown文件
-            output_file = f"output/archive/{TODAY}.md"
-            if os.path.exists(output_file):
-                print(f"✅ 成功爬取真实新闻并生成: {output_file}")
-
-                # 读取生成的Markdown并返回None（表示直接使用生成的文件）
-                with open(output_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-
-                # 返回特殊标记，表示已有完整的Markdown文件
-                return {'use_generated_file': True, 'content': content}
-
-            # 如果失败，继续下面的模板逻辑
-            print(f"⚠️  爬取脚本执行完毕，但未生成文件")
-        else:
-            print(f"⚠️  爬取脚本不存在: {fetch_script}")
+        items = fetch_real_news.fetch_news_items()
+        if items:
+            print(f"✅ 成功爬取 {len(items)} 条真实新闻")
+            # 特殊标记，表示条目来自爬取（使用爬取简报的格式）
+            return {'fetched': True, 'items': items}
+
+        print("⚠️  爬取流程执行完毕，但没有获取到新闻")
 
     except Exception as e:
-        print(f"⚠️  调用爬取脚本失败: {e}")
+        print(f"⚠️  爬取真实新闻失败: {e}")
 
     # 降级到简化模板（仅作为最后手段）
     print("⚠️  使用简化模板内容（建议检查网络连接）")
@@ -182,13 +341,11 @@ def generate_brief_with_dedup():
 
     # 如果环境变量未设置，尝试从配置文件读取
     if not api_key:
-        try:
-            with open('config/glm_config.json', 'r') as f:
-                config = json.load(f)
-                api_key = config.get('api_key')
-                print("✅ 从配置文件读取API密钥")
-        except Exception as e:
-            print(f"⚠️  无法读取配置文件: {e}")
+        api_key = load_glm_config().get('api_key')
+        if api_key:
+            print("✅ 从配置文件读取API密钥")
+        else:
+            print("⚠️  配置文件中没有API密钥")
 
     if api_key:
         content = generate_with_api(api_key, history_briefings)
@@ -197,7 +354,7 @@ def generate_brief_with_dedup():
 
     # 3. 去重检查
     print("🔍 正在检查内容重复...")
-    issues = check_content_dedup(content, history_briefings)
+    issues = check_content_dedup(content)
 
     if issues:
         print(f"\n⚠️  检测到 {len(issues)} 个潜在问题:")
@@ -205,16 +362,26 @@ def generate_brief_with_dedup():
             if issue['type'] == 'title_duplicate':
                 print(f"   {i}. 标题重复: {issue['title']}")
                 print(f"      (与 {issue['date']} 重复)")
+            elif issue['type'] == 'semantic_duplicate':
+                print(f"   {i}. 标题语义重复({issue['similarity']}): {issue['title']}")
+                print(f"      (与 {issue['date']} 的“{issue['similar_title']}”相近)")
+            elif issue['type'] == 'item_similarity':
+                print(f"   {i}. 条目内容相似度过高({issue['similarity']}): {issue['title']}")
+                print(f"      (与 {issue['date']} 的条目相似)")
             else:
                 print(f"   {i}. 内容相似度过高: {issue['similarity']}")
                 print(f"      (与 {issue['date']} 相似)")
 
-        print("\n🔄 正在生成备选内容...")
-        fallback_news = fetch_fallback_news()
-
-        # 重新构建简报（使用备选内容）
-        content = build_briefing_content(fallback_news)
-        print("✅ 已使用备选内容重新生成简报\n")
+        if any(issue['type'] == 'high_similarity' for issue in issues):
+            # 整体相似度过高：重新构建简报（使用备选内容）
+            print("\n🔄 正在生成备选内容...")
+            content = generate_with_template(history_briefings)
+            print("✅ 已使用备选内容重新生成简报\n")
+        else:
+            # 只有个别条目重复：逐条替换，保留其余内容
+            print("\n🔄 正在替换重复条目...")
+            content = replace_duplicate_items(content, issues)
+            print("✅ 已替换重复条目\n")
     else:
         print("✅ 内容检查通过，无重复问题\n")
 
@@ -283,9 +450,8 @@ def generate_brief_with_dedup():
 
 def generate_with_api(api_key, history_briefings):
     """使用GLM API生成简报"""
-    import requests
 
-    # 获取历史标题用于去重提示
+    # 获取历史标题用于去重提示（排序后取前5个，保证同样的历史得到同样的提示词）
     history_titles = set()
     for hist in history_briefings:
         for source, title in hist['headlines']:
@@ -293,7 +459,7 @@ def generate_with_api(api_key, history_briefings):
 
     exclude_hint = ""
     if history_titles:
-        exclude_hint = f"\n\n注意：请避免使用以下已出现的标题：\n" + "\n".join(list(history_titles)[:5])
+        exclude_hint = f"\n\n注意：请避免使用以下已出现的标题：\n" + "\n".join(sorted(history_titles)[:5])
 
     prompt = f"""请生成一份{DISPLAY_DATE}的法律简报。
 
@@ -324,33 +490,9 @@ def generate_with_api(api_key, history_briefings):
 """
 
     try:
-        headers = {
-            "Authorization": f"Bearer {api_key}",
-            "Content-Type": "application/json"
-        }
-
-        data = {
-            "model": "glm-4.7",
-            "messages": [
-                {"role": "user", "content": prompt}
-            ],
-            "temperature": 0.8,  # 提高温度以增加多样性
-            "max_tokens": 2000
-        }
-
-        response = requests.post(
-            "https://open.bigmodel.cn/api/paas/v4/chat/completions",
-            headers=headers,
-            json=data,
-            timeout=30
-        )
-
-        if response.status_code == 200:
-            result = response.json()
-            return result['choices'][0]['message']['content']
-        else:
-            print(f"⚠️  GLM API调用失败: {response.status_code}")
-            return generate_with_template(history_briefings)
+        # 提高温度以增加多样性
+        return chat_completion(api_key, prompt, temperature=0.8, max_tokens=2000,
+                               purpose='generate_with_dedup')
 
     except Exception as e:
         print(f"⚠️  GLM API调用异常: {e}")
@@ -362,11 +504,11 @@ def generate_with_template(history_briefings):
     # 使用备选新闻
     fallback_result = fetch_fallback_news()
 
-    # 检查是否是fetch_real_news.py生成的内容
-    if isinstance(fallback_result, dict) and fallback_result.get('use_generated_file'):
+    # 检查是否是爬取到的真实新闻
+    if isinstance(fallback_result, dict) and fallback_result.get('fetched'):
         # 直接使用爬取的真实新闻内容
         print("✅ 使用爬取的真实法律新闻")
-        return fallback_result['content']
+        return fetch_real_news.format_news_to_markdown(fallback_result['items'])
 
     # 否则使用模板新闻
     fallback_news = fallback_result
@@ -385,14 +527,7 @@ def build_briefing_content(news_items):
 """
 
     for news in news_items:
-        content += f"""### 【{news['source']}】{news['title']}
-
-- **来源**: {news['source']}
-- **时间**: {news['time']}
-- **摘要**: {news['summary']}
-- **实务影响**: {news['impact']}
-
-"""
+        content += format_news_item(news)
 
     content += """
 ---
@@ -403,4 +538,7 @@ def build_briefing_content(news_items):
     return content
 
 if __name__ == '__main__':
+    # --refresh：忽略已缓存的GLM响应，强制重新生成
+    if '--refresh' in sys.argv[1:]:
+        llm_cache.set_refresh()
     generate_brief_with_dedup()
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+GLM接口客户端
+统一读取 config/glm_config.json，经共享会话和重试引擎调用 chat/completions
+"""
+
+import os
+import json
+from urllib.parse import urljoin
+
+import llm_cache
+import token_ledger
+from http_session import get_session
+from retry_engine import (
+    RETRYABLE_STATUS_CODES,
+    RetryableStatusError,
+    RetryPolicy,
+    call_with_retry,
+    get_breaker,
+)
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.dirname(SCRIPT_DIR)
+
+GLM_CONFIG = os.path.join(PROJECT_DIR, 'config', 'glm_config.json')
+
+DEFAULT_API_BASE = "https://open.bigmodel.cn/api/paas/v4/"
+DEFAULT_MODEL = "glm-4.7"
+
+class GLMError(Exception):
+    """GLM接口返回不可重试的错误"""
+
+def load_glm_config(config_file=None):
+    """读取GLM配置，文件不存在或格式错误时返回空配置"""
+    try:
+        with open(config_file or GLM_CONFIG, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+def get_api_key(config=None):
+    """API密钥：环境变量优先，其次配置文件"""
+    if os.getenv('GLM_API_KEY'):
+        return os.getenv('GLM_API_KEY')
+    config = load_glm_config() if config is None else config
+    return config.get('api_key')
+
+def remaining_budget(config=None):
+    """今日剩余token预算，供调用方选择更省的prompt或更少的板块"""
+    return token_ledger.remaining_budget(load_glm_config() if config is None else config)
+
+def build_request(api_key, prompt, temperature, max_tokens, model, config, stream=False):
+    """构建chat/completions的URL、请求头和请求体"""
+    url = urljoin(config.get('api_base', DEFAULT_API_BASE), 'chat/completions')
+
+    headers = {
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": "application/json"
+    }
+
+    data = {
+        "model": model or config.get('model', DEFAULT_MODEL),
+        "messages": [
+            {"role": "user", "content": prompt}
+        ],
+        "temperature": temperature,
+        "max_tokens": max_tokens
+    }
+    if stream:
+        data['stream'] = True
+
+    return url, headers, data
+
+def check_status(response):
+    """可重试的状态码抛出 RetryableStatusError，其他非200抛出 GLMError"""
+    if response.status_code == 200:
+        return
+    response.close()
+    if response.status_code in RETRYABLE_STATUS_CODES:
+        raise RetryableStatusError(response.status_code)
+    raise GLMError(f"GLM API调用失败: {response.status_code}")
+
+def chat_completion(api_key, prompt, temperature=0.7, max_tokens=4000, model=None, config=None,
+                    purpose=None):
+    """调用chat/completions并返回生成的文本
+
+    网络错误、超时、429/5xx按 retry 配置重试；其他错误抛出 GLMError，
+    重试耗尽或端点熔断时抛出 RetryError，今日token预算不足时抛出 BudgetExceededError。
+    每次成功调用的usage都记入token账本（purpose用于区分调用方）。
+    相同参数的请求命中响应缓存时直接返回，不访问网络；因预算被调低 max_tokens 的结果不写入缓存。
+    """
+    config = load_glm_config() if config is None else config
+    model = model or config.get('model', DEFAULT_MODEL)
+
+    key = llm_cache.cache_key(model, prompt, temperature, max_tokens)
+    cached = llm_cache.get(key, config)
+    if cached is not None:
+        print(f"♻️  命中响应缓存（{purpose or model}）")
+        return cached
+
+    # 预算不足时 reserve 会调低 max_tokens，这样截短的结果不能存进按完整 max_tokens 计算的缓存键
+    requested_tokens = max_tokens
+    reservation, max_tokens = token_ledger.reserve(prompt, max_tokens, config)
+    downgraded = max_tokens < requested_tokens
+    url, headers, data = build_request(api_key, prompt, temperature, max_tokens, model, config)
+
+    def send(timeout):
+        response = get_session().post(url, headers=headers, json=data, timeout=timeout)
+        check_status(response)
+        return response.json()
+
+    try:
+        result = call_with_retry(send, url, RetryPolicy.from_config(config), get_breaker(url, config))
+        content = result['choices'][0]['message']['content']
+    except BaseException:
+        token_ledger.release(reservation)
+        raise
+
+    usage = result.get('usage') or {
+        'prompt_tokens': token_ledger.estimate_prompt_tokens(prompt),
+        'completion_tokens': len(content)
+    }
+    token_ledger.record_usage(usage, model=model, purpose=purpose, reservation=reservation)
+    if not downgraded:
+        llm_cache.put(key, content, model=model, usage=usage, config=config)
+
+    return content
+
+def stream_chat_completion(api_key, prompt, temperature=0.7, max_tokens=4000, model=None, config=None,
+                           purpose=None):
+    """以 stream: true 调用chat/completions，逐块产出生成的文本
+
+    只有建立连接（收到首个字节前）的阶段会重试；timeout作用于相邻数据块之间的间隔，
+    因此长时间生成不会因总时长触发超时。流结束或中断时都会把用量记入token账本，
+    完整结束且未因预算调低 max_tokens 的生成写入响应缓存，命中缓存时一次性产出全部文本。
+    """
+    config = load_glm_config() if config is None else config
+    model = model or config.get('model', DEFAULT_MODEL)
+
+    key = llm_cache.cache_key(model, prompt, temperature, max_tokens)
+    cached = llm_cache.get(key, config)
+    if cached is not None:
+        print(f"♻️  命中响应缓存（{purpose or model}）")
+        yield cached
+        return
+
+    # 预算不足时 reserve 会调低 max_tokens，这样截短的结果不能存进按完整 max_tokens 计算的缓存键
+    requested_tokens = max_tokens
+    reservation, max_tokens = token_ledger.reserve(prompt, max_tokens, config)
+    downgraded = max_tokens < requested_tokens
+    url, headers, data = build_request(api_key, prompt, temperature, max_tokens, model, config,
+                                       stream=True)
+
+    def connect(timeout):
+        response = get_session().post(url, headers=headers, json=data, timeout=timeout, stream=True)
+        check_status(response)
+        return response
+
+    try:
+        response = call_with_retry(connect, url, RetryPolicy.from_config(config), get_breaker(url, config))
+    except BaseException:
+        token_ledger.release(reservation)
+        raise
+
+    usage = None
+    parts = []
+    finished = False
+    try:
+        for line in response.iter_lines():
+            # SSE格式：每个事件一行 "data: {...}"，以 "data: [DONE]" 结束
+            if not line.startswith(b'data:'):
+                continue
+            payload = line[5:].strip()
+            if payload == b'[DONE]':
+                finished = True
+                break
+
+            chunk = json.loads(payload.decode('utf-8'))
+            usage = chunk.get('usage') or usage
+
+            for choice in chunk.get('choices', []):
+                text = (choice.get('delta') or {}).get('content')
+                if text:
+                    parts.append(text)
+                    yield text
+    finally:
+        response.close()
+        content = ''.join(parts)
+        usage = usage or {
+            'prompt_tokens': token_ledger.estimate_prompt_tokens(prompt),
+            'completion_tokens': len(content)
+        }
+        token_ledger.record_usage(usage, model=model, purpose=purpose, reservation=reservation)
+        if finished and not downgraded:
+            llm_cache.put(key, content, model=model, usage=usage, config=config)
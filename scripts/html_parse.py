@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+HTML解析层
+- 选择可用的最快解析器（优先lxml）
+- 按响应头/meta声明的字符集一次性解码
+- 用SoupStrainer只构建选择器需要的子树
+"""
+
+import re
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml  # noqa: F401
+    PARSER = 'lxml'
+except ImportError:
+    PARSER = 'html.parser'
+
+DEFAULT_ENCODING = 'utf-8'
+
+# 常见中文编码的超集，避免生僻字解码失败
+ENCODING_ALIASES = {
+    'gb2312': 'gb18030',
+    'gbk': 'gb18030',
+}
+
+HEADER_CHARSET_PATTERN = re.compile(r'charset=["\']?([\w-]+)', re.I)
+META_CHARSET_PATTERN = re.compile(rb'<meta[^>]+charset=["\']?([\w-]+)', re.I)
+
+# 选择器首段：tag、.class、[class*="xxx"]
+SELECTOR_HEAD_PATTERN = re.compile(
+    r'^(?P<tag>[a-zA-Z][\w-]*)?(?P<classes>(?:\.[\w-]+)*)'
+    r'(?:\[class\*=["\']?(?P<contains>[^"\'\]]+)["\']?\])?$'
+)
+
+def detect_encoding(content, content_type=''):
+    """依次根据Content-Type、BOM、<meta charset>判断编码"""
+    match = HEADER_CHARSET_PATTERN.search(content_type or '')
+    if match:
+        encoding = match.group(1)
+    elif content.startswith(b'\xef\xbb\xbf'):
+        encoding = 'utf-8-sig'
+    else:
+        match = META_CHARSET_PATTERN.search(content[:4096])
+        encoding = match.group(1).decode('ascii') if match else DEFAULT_ENCODING
+
+    encoding = encoding.lower()
+    return ENCODING_ALIASES.get(encoding, encoding)
+
+def decode_html(response):
+    """将响应字节按正确字符集解码一次"""
+    encoding = detect_encoding(response.content, response.headers.get('Content-Type', ''))
+
+    try:
+        return response.content.decode(encoding, errors='replace')
+    except LookupError:
+        return response.content.decode(DEFAULT_ENCODING, errors='replace')
+
+def make_soup(markup, parse_only=None):
+    """使用最快的可用解析器构建文档树"""
+    return BeautifulSoup(markup, PARSER, parse_only=parse_only)
+
+def build_strainer(selectors):
+    """为选择器级联构建一个SoupStrainer，只保留可能匹配的容器子树
+
+    每个选择器的首段必须带class约束，否则无法缩小范围，返回None（完整解析）。
+    得到的过滤条件是所有首段的并集（可能多保留一些元素），最终仍由选择器精确匹配。
+    """
+    names = set()
+    any_tag = False
+    exact_classes = set()
+    contains = set()
+
+    for selector in selectors:
+        head = selector.split()[0] if selector.split() else ''
+        match = SELECTOR_HEAD_PATTERN.match(head)
+        if not match or not (match.group('classes') or match.group('contains')):
+            return None
+
+        if match.group('tag'):
+            names.add(match.group('tag').lower())
+        else:
+            any_tag = True
+
+        exact_classes.update(c for c in match.group('classes').split('.') if c)
+        if match.group('contains'):
+            contains.add(match.group('contains'))
+
+    def class_matches(value):
+        if not value:
+            return False
+        # 不同版本的bs4会传入单个class或完整的class字符串
+        tokens = value.split() if isinstance(value, str) else value
+        return (any(token in exact_classes for token in tokens)
+                or any(part in ' '.join(tokens) for part in contains))
+
+    return SoupStrainer(None if any_tag else sorted(names), class_=class_matches)
+
+def parse_listing(markup, selectors, fallback_to_links=True):
+    """按选择器级联解析列表页，返回 (命中的选择器, 元素列表)
+
+    只解析选择器需要的子树；所有选择器都未命中时，
+    再只解析带href的链接作为兜底（此时选择器为None）。
+    """
+    soup = make_soup(markup, build_strainer(selectors))
+
+    for selector in selectors:
+        elements = soup.select(selector)
+        if elements:
+            return selector, elements
+
+    if not fallback_to_links:
+        return None, []
+
+    soup = make_soup(markup, SoupStrainer('a', href=True))
+    return None, soup.find_all('a', href=True)
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+HTML片段写入器
+渲染函数把片段交给 HtmlWriter，而不是 html += ... 反复拼接越来越长的字符串：
+- 不带输出流时片段收集在列表里，最后一次性 join
+- 带输出流（文件/stdout）时缓冲超过阈值就直接写出，内存占用不随页面大小增长
+"""
+
+import os
+import contextlib
+
+# 流式写出时的缓冲阈值（字符数）
+BUFFER_SIZE = int(os.getenv('HTML_WRITER_BUFFER', str(64 * 1024)))
+
+class HtmlWriter:
+    """收集HTML片段，可选地流式写入文件对象"""
+
+    def __init__(self, stream=None, buffer_size=BUFFER_SIZE):
+        self.stream = stream
+        self.buffer_size = buffer_size
+        self._parts = []
+        self._size = 0
+
+    def write(self, *fragments):
+        self._parts.extend(fragments)
+        if self.stream is None:
+            return
+
+        self._size += sum(map(len, fragments))
+        if self._size >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        """把缓冲区写入输出流（无输出流时不做任何事）"""
+        if self.stream is None or not self._parts:
+            return
+
+        self.stream.write(''.join(self._parts))
+        self._parts.clear()
+        self._size = 0
+
+    def getvalue(self):
+        """返回收集到的完整HTML（仅用于不带输出流的写入器）"""
+        if self.stream is not None:
+            raise ValueError("流式写入器的内容已写出，无法取回")
+        return ''.join(self._parts)
+
+@contextlib.contextmanager
+def open_output(path):
+    """原子写入HTML文件：先写到临时文件，成功后再替换，失败时不留下半截页面"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            writer = HtmlWriter(f)
+            yield writer
+            writer.flush()
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
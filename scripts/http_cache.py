@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+条件请求缓存（ETag / Last-Modified）
+按URL在磁盘上保存列表页的校验信息、正文和上次的提取结果，
+下次请求时携带 If-None-Match / If-Modified-Since，服务器返回304时直接复用
+"""
+
+import os
+import json
+import hashlib
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.dirname(SCRIPT_DIR)
+
+HTTP_CACHE_DIR = os.getenv('HTTP_CACHE_DIR', os.path.join(PROJECT_DIR, '.cache', 'http'))
+
+# 设置 HTTP_CACHE=0 可关闭缓存
+CACHE_ENABLED = os.getenv('HTTP_CACHE', '1') != '0'
+
+def cache_path(url):
+    """URL对应的缓存文件路径"""
+    key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+    return os.path.join(HTTP_CACHE_DIR, f"{key}.json")
+
+def load_entry(url):
+    """读取URL的缓存条目，不存在或损坏时返回None"""
+    if not CACHE_ENABLED:
+        return None
+
+    try:
+        with open(cache_path(url), 'r', encoding='utf-8') as f:
+            entry = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+    return entry if entry.get('url') == url else None
+
+def save_entry(url, entry):
+    """原子写入缓存条目"""
+    if not CACHE_ENABLED:
+        return
+
+    os.makedirs(HTTP_CACHE_DIR, exist_ok=True)
+    path = cache_path(url)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(dict(entry, url=url), f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+def conditional_headers(entry):
+    """根据缓存条目生成条件请求头"""
+    headers = {}
+    if not entry:
+        return headers
+
+    if entry.get('etag'):
+        headers['If-None-Match'] = entry['etag']
+    if entry.get('last_modified'):
+        headers['If-Modified-Since'] = entry['last_modified']
+
+    return headers
+
+def build_entry(response, body, items=None, extractor=None):
+    """由200响应构建缓存条目；服务器未提供校验信息时返回None"""
+    etag = response.headers.get('ETag')
+    last_modified = response.headers.get('Last-Modified')
+
+    if not etag and not last_modified:
+        return None
+
+    return {
+        'etag': etag,
+        'last_modified': last_modified,
+        'body': body,
+        'items': items,
+        'extractor': extractor,
+        'date': response.headers.get('Date'),
+        'fetched_at': time.time()
+    }
+
+def refresh_entry(entry, response):
+    """304响应确认缓存仍有效：更新时间戳，并采用服务器下发的新校验信息"""
+    entry = dict(entry, fetched_at=time.time())
+    for header, key in (('ETag', 'etag'), ('Last-Modified', 'last_modified'), ('Date', 'date')):
+        if response.headers.get(header):
+            entry[key] = response.headers[header]
+    return entry
+
+def extractor_signature(source):
+    """提取规则的指纹，规则变化后旧的提取结果不再复用"""
+    rules = {key: source.get(key) for key in (
+        'selectors', 'base_url', 'max_candidates', 'max_items',
+        'min_title_length', 'fallback_to_links', 'date_selector'
+    )}
+    return hashlib.sha256(json.dumps(rules, sort_keys=True).encode('utf-8')).hexdigest()[:16]
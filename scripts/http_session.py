@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+共享HTTP会话层
+所有脚本通过同一个requests.Session发起请求，按主机维护连接池并保持长连接，
+同一主机的重复请求（分页、详情页、重试、GLM调用）复用已建立的TCP/TLS连接
+
+另提供录制/回放传输层：录制模式把真实响应保存到fixture目录，
+回放模式从磁盘返回响应（可注入延迟和失败），用于离线基准测试和回归测试
+"""
+
+import os
+import json
+import time
+import random
+import hashlib
+import threading
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.dirname(SCRIPT_DIR)
+
+HTTP_CONFIG = os.path.join(PROJECT_DIR, 'config', 'http_config.json')
+
+DEFAULT_HTTP_CONFIG = {
+    'pool_connections': 10,  # 缓存的主机连接池数量
+    'pool_maxsize': 10,      # 每个主机连接池的最大连接数
+    'pool_block': False,     # 连接池耗尽时是否阻塞等待
+    'user_agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
+}
+
+DEFAULT_FIXTURE_DIR = os.path.join(PROJECT_DIR, 'fixtures', 'replay')
+
+# 录制时不保存的响应头（正文已解压，长度会变化）
+SKIPPED_RECORD_HEADERS = {'content-encoding', 'transfer-encoding', 'content-length', 'set-cookie'}
+
+_session = None
+_session_lock = threading.Lock()
+
+def load_http_config(config_file=None):
+    """读取连接池配置，环境变量优先于配置文件"""
+    config = dict(DEFAULT_HTTP_CONFIG)
+
+    try:
+        with open(config_file or HTTP_CONFIG, 'r', encoding='utf-8') as f:
+            config.update(json.load(f))
+    except FileNotFoundError:
+        pass
+
+    if os.getenv('HTTP_POOL_CONNECTIONS'):
+        config['pool_connections'] = int(os.getenv('HTTP_POOL_CONNECTIONS'))
+    if os.getenv('HTTP_POOL_MAXSIZE'):
+        config['pool_maxsize'] = int(os.getenv('HTTP_POOL_MAXSIZE'))
+
+    return config
+
+def create_session(config=None):
+    """创建带连接池的会话"""
+    config = config or load_http_config()
+
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=config['pool_connections'],
+        pool_maxsize=config['pool_maxsize'],
+        pool_block=config['pool_block']
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers['User-Agent'] = config['user_agent']
+
+    return session
+
+def get_session():
+    """获取进程内共享的会话（首次调用时创建）"""
+    global _session
+
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = create_session()
+
+    return _session
+
+def close_session():
+    """关闭共享会话并释放连接池"""
+    global _session
+
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+class FixtureMissingError(requests.ConnectionError):
+    """回放模式下请求没有对应的录制响应"""
+
+def fixture_key(method, url, body=None):
+    """请求对应的fixture文件名（不含扩展名）"""
+    digest = hashlib.sha256(f"{method.upper()} {url}".encode('utf-8'))
+    if body:
+        digest.update(body if isinstance(body, bytes) else body.encode('utf-8'))
+    host = urlparse(url).netloc.replace(':', '_') or 'local'
+    return f"{host}-{digest.hexdigest()[:24]}"
+
+def load_fixture(fixture_dir, method, url, body=None):
+    """读取录制的响应，返回 (元数据, 正文字节)，不存在时返回 (None, None)"""
+    key = fixture_key(method, url, body)
+
+    try:
+        with open(os.path.join(fixture_dir, f"{key}.json"), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        with open(os.path.join(fixture_dir, f"{key}.body"), 'rb') as f:
+            content = f.read()
+    except FileNotFoundError:
+        return None, None
+
+    return meta, content
+
+class RecordingAdapter(HTTPAdapter):
+    """正常发送请求，并把响应保存到fixture目录"""
+
+    def __init__(self, fixture_dir, **kwargs):
+        super().__init__(**kwargs)
+        self.fixture_dir = fixture_dir
+        os.makedirs(fixture_dir, exist_ok=True)
+
+    def send(self, request, stream=False, **kwargs):
+        response = super().send(request, stream=stream, **kwargs)
+
+        # 流式响应无法在不消费的情况下录制
+        if not stream:
+            key = fixture_key(request.method, request.url, request.body)
+            meta = {
+                'method': request.method,
+                'url': request.url,
+                'status': response.status_code,
+                'reason': response.reason,
+                'headers': {k: v for k, v in response.headers.items()
+                            if k.lower() not in SKIPPED_RECORD_HEADERS}
+            }
+            with open(os.path.join(self.fixture_dir, f"{key}.body"), 'wb') as f:
+                f.write(response.content)
+            with open(os.path.join(self.fixture_dir, f"{key}.json"), 'w', encoding='utf-8') as f:
+                json.dump(meta, f, ensure_ascii=False, indent=2)
+
+        return response
+
+class ReplayAdapter(BaseAdapter):
+    """从fixture目录返回响应，不访问网络
+
+    latency: 每个请求的模拟延迟（秒）
+    fail_rate: 随机抛出连接错误的概率（0-1），用于演练失败路径
+    没有录制响应的请求抛出 FixtureMissingError 并记入 misses，由调用方决定是否整体失败
+    """
+
+    def __init__(self, fixture_dir, latency=0.0, fail_rate=0.0, seed=None):
+        super().__init__()
+        self.fixture_dir = fixture_dir
+        self.latency = latency
+        self.fail_rate = fail_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.misses = []
+
+    def send(self, request, **kwargs):
+        if self.latency:
+            time.sleep(self.latency)
+
+        with self._lock:
+            failed = self._random.random() < self.fail_rate
+        if failed:
+            raise requests.ConnectionError(f"回放模式注入的失败: {request.url}", request=request)
+
+        meta, content = load_fixture(self.fixture_dir, request.method, request.url, request.body)
+        if meta is None:
+            with self._lock:
+                self.misses.append(f"{request.method} {request.url}")
+            raise FixtureMissingError(f"回放模式下没有录制的响应: {request.method} {request.url}",
+                                      request=request)
+
+        response = requests.Response()
+        response.status_code = meta['status']
+        response.reason = meta.get('reason')
+        response.headers = CaseInsensitiveDict(meta.get('headers', {}))
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = content
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+def configure_transport(record_dir=None, replay_dir=None, latency=0.0, fail_rate=0.0, seed=None):
+    """为共享会话挂载录制或回放传输层"""
+    session = get_session()
+
+    if replay_dir:
+        adapter = ReplayAdapter(replay_dir, latency=latency, fail_rate=fail_rate, seed=seed)
+        print(f"📼 回放模式: {replay_dir}（延迟 {latency * 1000:.0f}ms，失败率 {fail_rate:.0%}）")
+    elif record_dir:
+        config = load_http_config()
+        adapter = RecordingAdapter(
+            record_dir,
+            pool_connections=config['pool_connections'],
+            pool_maxsize=config['pool_maxsize'],
+            pool_block=config['pool_block']
+        )
+        print(f"🔴 录制模式: {record_dir}")
+    else:
+        return session
+
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
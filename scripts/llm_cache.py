@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+LLM响应缓存（按内容寻址）
+以 模型 + prompt + temperature + max_tokens 的哈希为键保存生成结果，
+同样的请求再次发起时直接返回缓存，不访问网络、不消耗token；
+按存放时间和总大小淘汰旧条目
+"""
+
+import os
+import json
+import time
+import threading
+import hashlib
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.dirname(SCRIPT_DIR)
+
+LLM_CACHE_DIR = os.getenv('LLM_CACHE_DIR', os.path.join(PROJECT_DIR, '.cache', 'llm'))
+
+DEFAULT_MAX_AGE_DAYS = 7
+DEFAULT_MAX_SIZE_MB = 50
+
+# 为True时忽略已有缓存（仍会写入新结果），可通过 --refresh 或 LLM_CACHE_REFRESH=true 开启
+REFRESH = os.getenv('LLM_CACHE_REFRESH', '').lower() == 'true'
+
+def set_refresh(refresh=True):
+    """强制刷新：本进程内的请求都不读取缓存"""
+    global REFRESH
+    REFRESH = refresh
+
+def cache_key(model, prompt, temperature, max_tokens):
+    """请求参数的内容哈希"""
+    payload = json.dumps({
+        'model': model,
+        'prompt': prompt,
+        'temperature': temperature,
+        'max_tokens': max_tokens
+    }, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def cache_settings(config=None):
+    """读取 glm_config.json 的 cache 段"""
+    settings = (config or {}).get('cache', {})
+    return (
+        settings.get('max_age_days', DEFAULT_MAX_AGE_DAYS) * 86400,
+        settings.get('max_size_mb', DEFAULT_MAX_SIZE_MB) * 1024 * 1024
+    )
+
+def get(key, config=None):
+    """读取缓存的生成文本，未命中、过期或处于刷新模式时返回None"""
+    if REFRESH:
+        return None
+
+    path = os.path.join(LLM_CACHE_DIR, f"{key}.json")
+    max_age, _ = cache_settings(config)
+
+    try:
+        if time.time() - os.path.getmtime(path) > max_age:
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)['content']
+    except (FileNotFoundError, ValueError, KeyError):
+        return None
+
+def put(key, content, model=None, usage=None, config=None):
+    """原子写入缓存条目，随后按时间和大小淘汰"""
+    os.makedirs(LLM_CACHE_DIR, exist_ok=True)
+    path = os.path.join(LLM_CACHE_DIR, f"{key}.json")
+    # 临时文件名带上线程号：并发生成的各板块可能同时写入同一个键
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'model': model,
+            'content': content,
+            'usage': usage,
+            'created_at': time.time()
+        }, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+    evict(config)
+
+def evict(config=None):
+    """删除过期条目；总大小超限时从最旧的开始删除"""
+    max_age, max_size = cache_settings(config)
+    now = time.time()
+
+    entries = []
+    for name in os.listdir(LLM_CACHE_DIR):
+        if not name.endswith('.json'):
+            continue
+        path = os.path.join(LLM_CACHE_DIR, name)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue
+        if now - stat.st_mtime > max_age:
+            _remove(path)
+        else:
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_size:
+            break
+        _remove(path)
+        total -= size
+
+def _remove(path):
+    """删除缓存文件；并发的 put()/evict() 可能已经删掉同一个条目，忽略即可"""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
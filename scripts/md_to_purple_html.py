@@ -1,692 +1,273 @@
 #!/usr/bin/env python3
 """
 将Markdown内容转换为紫色主题HTML（支持5个板块+锚点导航）
+板块和条目结构来自简报IR（briefing_ir），不再在这里解析Markdown
 """
 
+import os
 import sys
 import re
-
-def md_to_purple_html(md_file, date_str, display_date):
+import hashlib
+import textwrap
+import functools
+
+import briefing_ir
+import page_template
+from html_writer import HtmlWriter, open_output
+
+# 外链模式下共享样式/脚本的输出目录（相对站点根目录，即项目根目录）
+ASSETS_DIR = os.getenv('PURPLE_ASSETS_DIR', 'assets')
+
+# 页面里引用共享样式/脚本的地址（href="..." 或 src="..."）
+ASSET_LINK_PATTERN = re.compile(r'((?:href|src)=")([^"]*purple\.[0-9a-f]{10}\.(?:css|js))(?=")')
+
+def asset_files():
+    """外链模式的共享文件：{'css'/'js': (带内容哈希的文件名, 内容)}
+
+    文件名随内容变化，页面引用的URL可以被浏览器和CDN长期缓存
+    """
+    files = {}
+    for kind in ('css', 'js'):
+        content = page_template.load_text(f"purple.{kind}")
+        digest = hashlib.sha256(content.encode('utf-8')).hexdigest()[:10]
+        files[kind] = (f"purple.{digest}.{kind}", content)
+    return files
+
+def publish_assets(site_dir='.'):
+    """把共享样式/脚本写入站点目录下的 ASSETS_DIR（已存在则跳过），
+    返回页面引用用的 {'css': href, 'js': href}（相对站点根目录）"""
+    assets_dir = os.path.join(site_dir, ASSETS_DIR)
+    os.makedirs(assets_dir, exist_ok=True)
+    hrefs = {}
+
+    for kind, (name, content) in asset_files().items():
+        path = os.path.join(assets_dir, name)
+        if not os.path.exists(path):
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+        hrefs[kind] = f"{ASSETS_DIR.replace(os.sep, '/').rstrip('/')}/{name}"
+
+    return hrefs
+
+def relative_assets(assets, html_file, site_dir):
+    """把相对站点根目录的资源地址换成相对 html_file 所在目录的地址
+
+    页面不在站点根目录（如 archive/ 下）时，浏览器按页面自己的目录解析相对地址
+    """
+    page_dir = os.path.dirname(os.path.abspath(html_file))
+    site_dir = os.path.abspath(site_dir)
+    return {kind: os.path.relpath(os.path.join(site_dir, href), page_dir).replace(os.sep, '/')
+            for kind, href in assets.items()}
+
+def rebase_asset_links(html, from_dir, to_dir):
+    """页面从 from_dir 复制到 to_dir 时改写其中的共享资源地址，内联页面原样返回"""
+    def rebase(match):
+        target = os.path.join(os.path.abspath(from_dir), match.group(2))
+        return match.group(1) + os.path.relpath(target, os.path.abspath(to_dir)).replace(os.sep, '/')
+
+    return ASSET_LINK_PATTERN.sub(rebase, html)
+
+def md_to_purple_html(md_file, date_str, display_date, out=None, assets=None):
     """读取Markdown并转换为紫色主题HTML"""
 
-    with open(md_file, 'r', encoding='utf-8') as f:
-        md_content = f.read()
-
-    # 提取导语
-    intro_match = re.search(r'\*\*导语：\*\*(.+?)(?=\n---|\n##)', md_content, re.DOTALL)
-    intro = intro_match.group(1).strip() if intro_match else "今日法律界最新资讯更新。"
-
-    # 提取各板块内容
-    sections = {}
-    section_names = {
-        '1. 今日要闻': 'today',
-        '2. 新规速递': 'newrules',
-        '3. 典型案例': 'cases',
-        '4. 趋势洞察': 'trends',
-        '5. 深度阅读': 'reading'
-    }
-
-    # 分割各板块
-    current_section = None
-    section_content = {}
-
-    lines = md_content.split('\n')
-    for line in lines:
-        if line.startswith('## ') and line[3:] in section_names:
-            current_section = line[3:]
-            section_content[current_section] = []
-        elif current_section:
-            section_content[current_section].append(line)
-
-    # 构建HTML
-    html = f"""<!DOCTYPE html>
-<html lang="zh-CN">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{display_date} 法律简报</title>
-    <style>
-        * {{
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }}
-
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, "Helvetica Neue", Arial, "Noto Sans SC", sans-serif;
-            line-height: 1.8;
-            color: #333;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            min-height: 100vh;
-            padding: 20px;
-        }}
-
-        .container {{
-            max-width: 900px;
-            margin: 0 auto;
-            background: white;
-            border-radius: 12px;
-            box-shadow: 0 10px 40px rgba(0,0,0,0.1);
-            overflow: hidden;
-        }}
-
-        header {{
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            padding: 50px 40px;
-            text-align: center;
-        }}
-
-        header h1 {{
-            font-size: 2.2em;
-            margin-bottom: 15px;
-            font-weight: 700;
-        }}
-
-        header .date {{
-            font-size: 1.1em;
-            opacity: 0.95;
-            font-weight: 300;
-        }}
-
-        header .intro {{
-            margin-top: 20px;
-            font-size: 1.05em;
-            line-height: 1.6;
-            opacity: 0.95;
-            text-align: left;
-            background: rgba(255,255,255,0.1);
-            padding: 20px;
-            border-radius: 8px;
-        }}
-
-        /* 导航菜单 */
-        .nav-menu {{
-            background: #f8f9fa;
-            padding: 20px 40px;
-            border-bottom: 2px solid #667eea;
-            position: sticky;
-            top: 0;
-            z-index: 100;
-        }}
-
-        .nav-menu ul {{
-            list-style: none;
-            display: flex;
-            flex-wrap: wrap;
-            gap: 15px;
-            justify-content: center;
-        }}
-
-        .nav-menu li {{
-            margin: 0;
-        }}
-
-        .nav-menu a {{
-            display: block;
-            padding: 10px 20px;
-            background: white;
-            color: #667eea;
-            text-decoration: none;
-            border-radius: 8px;
-            font-weight: 500;
-            transition: all 0.3s;
-            border: 2px solid #667eea;
-        }}
-
-        .nav-menu a:hover {{
-            background: #667eea;
-            color: white;
-            transform: translateY(-2px);
-        }}
-
-        .content {{
-            padding: 40px;
-        }}
-
-        .section {{
-            margin-bottom: 50px;
-            scroll-margin-top: 120px;
-        }}
-
-        .section h2 {{
-            color: #667eea;
-            font-size: 1.8em;
-            margin-bottom: 25px;
-            padding-bottom: 12px;
-            border-bottom: 3px solid #667eea;
-        }}
-
-        .section h3 {{
-            color: #764ba2;
-            font-size: 1.3em;
-            margin-top: 30px;
-            margin-bottom: 15px;
-            font-weight: 600;
-        }}
-
-        .news-item {{
-            background: #f8f9fa;
-            padding: 25px;
-            border-radius: 10px;
-            margin-bottom: 20px;
-            border-left: 5px solid #667eea;
-            transition: all 0.3s;
-        }}
-
-        .news-item:hover {{
-            box-shadow: 0 4px 15px rgba(102, 126, 234, 0.15);
-            transform: translateY(-2px);
-        }}
-
-        .news-item h4 {{
-            color: #333;
-            font-size: 1.2em;
-            margin-bottom: 15px;
-            font-weight: 600;
-        }}
-
-        .news-item p {{
-            color: #555;
-            margin-bottom: 10px;
-            line-height: 1.7;
-        }}
-
-        .news-item strong {{
-            color: #667eea;
-        }}
-
-        .meta {{
-            background: white;
-            padding: 12px 15px;
-            border-radius: 6px;
-            margin-top: 12px;
-            font-size: 0.9em;
-            color: #666;
-            display: flex;
-            flex-wrap: wrap;
-            gap: 15px;
-        }}
-
-        .meta span {{
-            display: inline-flex;
-            align-items: center;
-        }}
-
-        .impact {{
-            background: #fff3cd;
-            border-left: 5px solid #ffc107;
-            padding: 15px;
-            margin-top: 15px;
-            border-radius: 6px;
-        }}
-
-        .impact strong {{
-            color: #856404;
-        }}
-
-        /* 趋势洞察板块 */
-        .trend-box {{
-            background: #f8f9fa;
-            padding: 20px;
-            border-radius: 8px;
-            margin-bottom: 20px;
-            border-left: 4px solid #764ba2;
-        }}
-
-        .trend-box h4 {{
-            color: #764ba2;
-            margin-bottom: 12px;
-            font-size: 1.1em;
-        }}
-
-        ul {{
-            margin-left: 25px;
-            margin-top: 10px;
-        }}
-
-        li {{
-            margin-bottom: 8px;
-            line-height: 1.7;
-        }}
-
-        /* 深度阅读链接列表 */
-        .reading-links {{
-            list-style: none;
-            margin-left: 0;
-        }}
-
-        .reading-links li {{
-            margin-bottom: 12px;
-            padding: 15px;
-            background: #f8f9fa;
-            border-radius: 8px;
-            border-left: 4px solid #667eea;
-            transition: all 0.3s;
-        }}
-
-        .reading-links li:hover {{
-            box-shadow: 0 2px 10px rgba(102, 126, 234, 0.1);
-            transform: translateX(5px);
-        }}
-
-        .reading-links a {{
-            color: #667eea;
-            text-decoration: none;
-            font-weight: 500;
-            font-size: 1.05em;
-        }}
-
-        .reading-links a:hover {{
-            color: #764ba2;
-            text-decoration: underline;
-        }}
-
-        .tag {{
-            display: inline-block;
-            background: #667eea;
-            color: white;
-            padding: 5px 14px;
-            border-radius: 20px;
-            font-size: 0.85em;
-            margin-right: 8px;
-            margin-bottom: 5px;
-        }}
-
-        a {{
-            color: #667eea;
-            text-decoration: none;
-            transition: color 0.3s;
-        }}
-
-        a:hover {{
-            color: #764ba2;
-            text-decoration: underline;
-        }}
-
-        .back-link {{
-            display: inline-block;
-            background: #667eea;
-            color: white;
-            padding: 12px 25px;
-            border-radius: 8px;
-            margin-bottom: 20px;
-            font-weight: 500;
-            transition: all 0.3s;
-        }}
-
-        .back-link:hover {{
-            background: #764ba2;
-            text-decoration: none;
-            transform: translateY(-2px);
-        }}
-
-        .back-to-top {{
-            position: fixed;
-            bottom: 30px;
-            right: 30px;
-            background: #667eea;
-            color: white;
-            width: 50px;
-            height: 50px;
-            border-radius: 50%;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            font-size: 24px;
-            cursor: pointer;
-            box-shadow: 0 4px 15px rgba(102, 126, 234, 0.3);
-            transition: all 0.3s;
-            opacity: 0;
-            visibility: hidden;
-        }}
-
-        .back-to-top.show {{
-            opacity: 1;
-            visibility: visible;
-        }}
-
-        .back-to-top:hover {{
-            background: #764ba2;
-            transform: translateY(-5px);
-        }}
-
-        footer {{
-            background: #f8f9fa;
-            padding: 30px 40px;
-            text-align: center;
-            color: #666;
-            border-top: 1px solid #e9ecef;
-        }}
-
-        @media (max-width: 768px) {{
-            header {{
-                padding: 30px 20px;
-            }}
-            header h1 {{
-                font-size: 1.6em;
-            }}
-            .content {{
-                padding: 20px;
-            }}
-            .section h2 {{
-                font-size: 1.4em;
-            }}
-            .nav-menu {{
-                padding: 15px 20px;
-            }}
-            .nav-menu ul {{
-                flex-direction: column;
-                gap: 8px;
-            }}
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <header>
-            <h1>{display_date} 法律简报</h1>
-            <p class="date">发布时间：{date_str}</p>
-            <div class="intro">
-                <strong>导语：</strong>{intro}
-            </div>
-        </header>
-
-        <!-- 导航菜单 -->
-        <nav class="nav-menu">
-            <ul>
-                <li><a href="#today">今日要闻</a></li>
-                <li><a href="#newrules">新规速递</a></li>
-                <li><a href="#cases">典型案例</a></li>
-                <li><a href="#trends">趋势洞察</a></li>
-                <li><a href="#reading">深度阅读</a></li>
-            </ul>
-        </nav>
-
-        <div class="content">
-            <a href="index.html" class="back-link">← 返回首页</a>
-"""
+    briefing = briefing_ir.load(md_file)
+    return render_briefing(briefing, date_str, display_date, out, assets)
 
-    # 处理各板块
-    for section_name in ['1. 今日要闻', '2. 新规速递', '3. 典型案例', '4. 趋势洞察', '5. 深度阅读']:
-        section_id = section_names[section_name]
+def page_dates(md_file):
+    """由文件名中的日期得到 (发布日期, 显示日期)，文件名不含日期时用今天"""
+    date_match = re.search(r'(\d{4}-\d{2}-\d{2})', md_file)
 
-        if section_name not in section_content:
+    if date_match:
+        date_str = date_match.group(1)
+        display_date = date_str.replace('-', '年') + '日'
+    else:
+        from datetime import datetime
+        date_str = datetime.now().strftime('%Y-%m-%d')
+        display_date = datetime.now().strftime('%Y年%m月%d日')
+
+    return date_str, display_date
+
+def write_page(md_file, html_file, assets=None, site_dir=None):
+    """把Markdown渲染为HTML文件（原子写入，末尾换行与命令行输出一致）
+
+    assets 的地址相对站点根目录 site_dir（默认为 html_file 所在目录），
+    写入时换算成相对 html_file 所在目录的地址
+    """
+    date_str, display_date = page_dates(md_file)
+    if assets:
+        assets = relative_assets(assets, html_file, site_dir or os.path.dirname(html_file) or '.')
+    with open_output(html_file) as writer:
+        md_to_purple_html(md_file, date_str, display_date, writer, assets)
+        writer.write('\n')
+
+def render_briefing(briefing, date_str, display_date, out=None, assets=None):
+    """把简报IR渲染为紫色主题HTML
+
+    out 为 HtmlWriter 时片段直接写入（可流式输出到文件），返回None；
+    否则在内部收集后返回完整HTML字符串
+    assets 为 publish_assets() 的返回值时引用共享的样式/脚本文件，否则内联
+    """
+    intro = briefing.intro if briefing.intro is not None else "今日法律界最新资讯更新。"
+    sections = {section.key: section for section in briefing.sections if section.key}
+
+    if assets:
+        # 外链共享的指纹化样式，theme-color 同时保留紫色主题标记
+        head_assets = ('    <meta name="theme-color" content="#667eea">\n'
+                       f'    <link rel="stylesheet" href="{assets["css"]}">\n')
+        script = f'    <script src="{assets["js"]}"></script>\n'
+    else:
+        head_assets = f"    <style>\n{_inline(page_template.load_text('purple.css'))}    </style>\n"
+        script = f"    <script>\n{_inline(page_template.load_text('purple.js'))}    </script>\n"
+
+    return page_template.get('purple_page.html').render(
+        out,
+        display_date=display_date,
+        date_str=date_str,
+        intro=intro,
+        head_assets=head_assets,
+        content=lambda write: write_sections(write, sections),
+        script=script,
+    )
+
+@functools.lru_cache(maxsize=8)
+def _inline(text):
+    """内联到页面时按原有缩进排版样式/脚本"""
+    return textwrap.indent(text, ' ' * 8)
+
+def write_sections(write, sections):
+    """按固定顺序写出各板块HTML"""
+    # 处理各板块
+    for section_name, section_id in briefing_ir.SECTION_KEYS.items():
+        if section_id not in sections:
             continue
 
-        html += f'\n            <!-- {section_name} -->\n'
-        html += f'            <section class="section" id="{section_id}">\n'
-        html += f'                <h2>{section_name}</h2>\n\n'
-
-        content_lines = section_content[section_name]
-
-        if section_name == '1. 今日要闻':
-            # 解析新闻项
-            news_items = re.findall(r'### 【(.+?)】(.+?)(?=###|---\n\n##|\Z)', '\n'.join(content_lines), re.DOTALL)
-
-            for source, content_block in news_items:
-                lines = content_block.strip().split('\n')
-                title = lines[0].strip() if lines else ""
-
-                data = {'source': source}
-                summary_lines = []
-                in_summary = False
-                impact_lines = []
-                in_impact = False
-
-                for line in lines[1:]:
-                    line = line.strip()
-                    if not line:
-                        continue
-
-                    if '- **来源**:' in line:
-                        data['source'] = line.split('- **来源**:')[1].strip()
-                    elif '- **发布时间**:' in line or '- **会议时间**:' in line or '- **时间**:' in line:
-                        data['time'] = line.split(':**')[1].strip() if ':**' in line else line.split(':')[1].strip()
-                    elif '- **链接**:' in line:
-                        data['link'] = line.split('- **链接**:')[1].strip()
-                    elif '- **生效时间**:' in line:
-                        data['effective'] = line.split('- **生效时间**:')[1].strip()
-                    elif '- **摘要**:' in line or '- **摘要**：' in line:
-                        # 摘要内容在同一行，提取冒号后面的内容
-                        summary_content = line.split(':', 1)[1].strip() if ':' in line else ''
-                        if summary_content:
-                            summary_lines.append(summary_content)
-                        in_summary = False
-                        in_impact = False
-                    elif '- **实务影响**:' in line or '- **实务影响**：' in line:
-                        # 实务影响内容在同一行，提取冒号后面的内容
-                        impact_content = line.split(':', 1)[1].strip() if ':' in line else ''
-                        if impact_content:
-                            impact_lines.append(impact_content)
-                        in_summary = False
-                        in_impact = False
-                    elif line.startswith('---') or line.startswith('**核心要点**'):
-                        in_summary = False
-                        in_impact = False
-
-                if summary_lines:
-                    data['summary'] = ' '.join(summary_lines).strip()
-                if impact_lines:
-                    data['impact'] = ' '.join(impact_lines).strip()
-
-                html += """                <div class="news-item">
+        write(f'\n            <!-- {section_name} -->\n')
+        write(f'            <section class="section" id="{section_id}">\n')
+        write(f'                <h2>{section_name}</h2>\n\n')
+
+        items = sections[section_id].items
+
+        if section_id == 'today':
+            for item in items:
+                if item.tag is None:
+                    continue
+
+                write("""                <div class="news-item">
                     <h4>【{source}】{title}</h4>
-""".format(source=data['source'], title=title)
+""".format(source=item.tag if item.source is None else item.source, title=item.title))
 
-                if 'time' in data or 'effective' in data:
-                    if 'time' in data:
-                        html += f"                    <p><strong>时间：</strong>{data['time']}</p>\n"
-                    if 'effective' in data:
-                        html += f"                    <p><strong>生效时间：</strong>{data['effective']}</p>\n"
+                if item.time is not None:
+                    write(f"                    <p><strong>时间：</strong>{item.time}</p>\n")
+                if item.effective is not None:
+                    write(f"                    <p><strong>生效时间：</strong>{item.effective}</p>\n")
 
-                if 'summary' in data:
-                    html += f"                    <p><strong>摘要：</strong>{data['summary']}</p>\n"
+                if item.summary is not None:
+                    write(f"                    <p><strong>摘要：</strong>{item.summary}</p>\n")
 
-                if 'impact' in data:
-                    html += f"""                    <div class="impact">
-                        <strong>实务影响：</strong>{data['impact']}
+                if item.impact is not None:
+                    write(f"""                    <div class="impact">
+                        <strong>实务影响：</strong>{item.impact}
                     </div>
-"""
+""")
 
-                html += "                </div>\n\n"
+                write("                </div>\n\n")
 
-        elif section_name == '2. 新规速递':
+        elif section_id == 'newrules':
             # 处理新规速递
-            subsections = re.split(r'###\s+', '\n'.join(content_lines))
-            for subsection in subsections[1:]:  # 跳过第一个空元素
-                lines = subsection.strip().split('\n')
-                if not lines:
-                    continue
-
-                title = lines[0].strip().rstrip('*').strip()
-                html += f'                <h3>{title}</h3>\n'
+            for item in items:
+                write(f'                <h3>{item.heading.rstrip("*").strip()}</h3>\n')
 
-                # 查找news-item
-                items = re.findall(r'\*\*(.+?)\*\*\n((?:.|\n)+?)(?=\n\n\*\*|\Z)', subsection)
-                for item_title, item_content in items:
-                    html += """                <div class="news-item">
+                for entry in item.entries:
+                    write("""                <div class="news-item">
                     <h4>{title}</h4>
-""".format(title=item_title.strip())
+""".format(title=entry.title))
 
-                    # 解析内容
-                    content_lines = item_content.strip().split('\n')
-                    for line in content_lines:
-                        line = line.strip().lstrip('-').strip()
-                        if line:
-                            # 处理粗体标记
-                            line = re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', line)
-                            html += f"                    <p>{line}</p>\n"
+                    for line in entry.lines:
+                        # 处理粗体标记
+                        line = re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', line)
+                        write(f"                    <p>{line}</p>\n")
 
-                    html += "                </div>\n\n"
+                    write("                </div>\n\n")
 
-        elif section_name == '3. 典型案例':
+        elif section_id == 'cases':
             # 处理典型案例
-            subsections = re.split(r'###\s+', '\n'.join(content_lines))
-            for subsection in subsections[1:]:  # 跳过第一个空元素
-                lines = subsection.strip().split('\n')
-                if not lines:
-                    continue
-
-                title = lines[0].strip().rstrip('*').strip()
-                html += f'                <h3>{title}</h3>\n'
+            for item in items:
+                write(f'                <h3>{item.heading.rstrip("*").strip()}</h3>\n')
 
-                # 查找news-item - 支持单换行和双换行
-                items = re.split(r'\n\*\*(.+?)\*\*:', subsection)
-                current_item = None
+                for entry in item.entries:
+                    write("""                <div class="news-item">
+                    <h4>{title}</h4>
+""".format(title=entry.title))
+
+                    # 解析列表项和段落
+                    in_list = False
+                    for line in entry.lines:
+                        # 检查是否是列表项
+                        if line.startswith('-'):
+                            if not in_list:
+                                write('                    <ul>\n')
+                                in_list = True
+                            # 移除开头的"- "和粗体标记
+                            content = re.sub(r'^-\s+\*\*(.+?)\*\*:\s*', r'\1：', line)
+                            content = re.sub(r'^-\s+', '', content)
+                            content = re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', content)
+                            write(f"                        <li>{content}</li>\n")
+                        else:
+                            if in_list:
+                                write('                    </ul>\n')
+                                in_list = False
+                            # 处理普通段落
+                            content = re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', line)
+                            write(f"                    <p>{content}</p>\n")
 
-                for i, part in enumerate(items):
-                    if i == 0:
-                        continue  # 跳过标题后的内容
+                    if in_list:
+                        write('                    </ul>\n')
 
-                    if i % 2 == 1:  # 这是标题
-                        current_item = {'title': part.strip(), 'content': ''}
-                    elif i % 2 == 0 and current_item:  # 这是内容
-                        # 找到下一个标题的开始位置
-                        next_title_match = re.search(r'\n\*\*(.+?)\*\*:', part)
-                        if next_title_match:
-                            current_item['content'] = part[:next_title_match.start()].strip()
-                        else:
-                            current_item['content'] = part.strip()
+                    write("                </div>\n\n")
 
-                        html += """                <div class="news-item">
-                    <h4>{title}</h4>
-""".format(title=current_item['title'])
-
-                        # 解析列表项和段落
-                        lines = current_item['content'].split('\n')
-                        in_list = False
-                        for line in lines:
-                            line = line.strip()
-                            if not line:
-                                continue
-
-                            # 检查是否是列表项
-                            if line.startswith('-'):
-                                if not in_list:
-                                    html += '                    <ul>\n'
-                                    in_list = True
-                                # 移除开头的"- "和粗体标记
-                                content = re.sub(r'^-\s+\*\*(.+?)\*\*:\s*', r'\1：', line)
-                                content = re.sub(r'^-\s+', '', content)
-                                content = re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', content)
-                                html += f"                        <li>{content}</li>\n"
-                            else:
-                                if in_list:
-                                    html += '                    </ul>\n'
-                                    in_list = False
-                                # 处理普通段落
-                                content = re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', line)
-                                html += f"                    <p>{content}</p>\n"
-
-                        if in_list:
-                            html += '                    </ul>\n'
-
-                        html += "                </div>\n\n"
-                        current_item = None
-
-        elif section_name == '4. 趋势洞察':
+        elif section_id == 'trends':
             # 处理趋势洞察
-            subsections = re.split(r'###\s+', '\n'.join(content_lines))
-            for subsection in subsections[1:]:  # 跳过第一个空元素
-                lines = subsection.strip().split('\n')
-                if not lines:
-                    continue
-
-                title = lines[0].strip().rstrip('*').strip()
-                html += f'                <div class="trend-box">\n'
-                html += f'                    <h4>{title}</h4>\n'
-                html += '                    <ul>\n'
+            for item in items:
+                write(f'                <div class="trend-box">\n')
+                write(f'                    <h4>{item.heading.rstrip("*").strip()}</h4>\n')
+                write('                    <ul>\n')
 
-                # 查找列表项
-                list_items = re.findall(r'[\s-]*\*\*(.+?)\*\*:?\s*(.+)', subsection)
-                for item in list_items:
-                    if len(item) == 2:
-                        label, content = item
-                        html += f"                        <li><strong>{label}：</strong>{content}</li>\n"
+                for trend in item.fields:
+                    write(f"                        <li><strong>{trend.label}：</strong>{trend.text}</li>\n")
 
-                html += "                    </ul>\n"
-                html += "                </div>\n\n"
+                write("                    </ul>\n")
+                write("                </div>\n\n")
 
-        elif section_name == '5. 深度阅读':
+        elif section_id == 'reading':
             # 处理深度阅读
-            subsections = re.split(r'###\s+', '\n'.join(content_lines))
-            for subsection in subsections[1:]:  # 跳过第一个空元素
-                lines = subsection.strip().split('\n')
-                if not lines:
-                    continue
+            for item in items:
+                write(f'                <h3>{item.heading.rstrip("*").strip()}</h3>\n')
+                write('                <ul class="reading-links">\n')
 
-                title = lines[0].strip().rstrip('*').strip()
-                html += f'                <h3>{title}</h3>\n'
-                html += '                <ul class="reading-links">\n'
-
-                # 查找链接
-                links = re.findall(r'\-\s*\[(.+?)\]\((.+?)\)', subsection)
-                for link_text, link_url in links:
-                    html += f'                    <li><a href="{link_url}" target="_blank">{link_text}</a></li>\n'
-
-                html += "                </ul>\n\n"
-
-        html += "            </section>\n"
-
-    # HTML结尾
-    html += """
-        </div>
-
-        <footer>
-            <p>本简报由GLM-4.7 AI自动生成，仅供学习参考，不构成法律建议</p>
-            <p style="margin-top: 10px;">© 2026 每日法律简报 | 生成时间: {date_str}</p>
-        </footer>
-
-        <div class="back-to-top" onclick="window.scrollTo({{top: 0, behavior: 'smooth'}})">↑</div>
-    </div>
-
-    <script>
-        // 返回顶部按钮显示/隐藏
-        window.addEventListener('scroll', function() {{
-            const backToTop = document.querySelector('.back-to-top');
-            if (window.pageYOffset > 300) {{
-                backToTop.classList.add('show');
-            }} else {{
-                backToTop.classList.remove('show');
-            }}
-        }});
-
-        // 平滑滚动到锚点
-        document.querySelectorAll('a[href^="#"]').forEach(anchor => {{
-            anchor.addEventListener('click', function (e) {{
-                e.preventDefault();
-                const target = document.querySelector(this.getAttribute('href'));
-                if (target) {{
-                    target.scrollIntoView({{
-                        behavior: 'smooth',
-                        block: 'start'
-                    }});
-                }}
-            }});
-        }});
-    </script>
-</body>
-</html>
-"""
+                for link in item.links:
+                    write(f'                    <li><a href="{link.url}" target="_blank">{link.text}</a></li>\n')
+
+                write("                </ul>\n\n")
+
+        write("            </section>\n")
 
-    return html
 
 if __name__ == '__main__':
-    if len(sys.argv) < 2:
-        print("Usage: python3 md_to_purple_html.py <md_file>")
+    args = [arg for arg in sys.argv[1:] if arg != '--assets']
+    if len(args) < 1:
+        print("Usage: python3 md_to_purple_html.py <md_file> [--assets]")
+        print("  --assets  样式/脚本写入 assets/purple.<hash>.css/.js 并在页面中引用，不再内联")
+        print("            （引用地址相对当前目录，输出的页面须放在站点根目录）")
         sys.exit(1)
 
-    md_file = sys.argv[1]
-    date_match = re.search(r'(\d{4}-\d{2}-\d{2})', md_file)
-
-    if date_match:
-        date_str = date_match.group(1)
-        display_date = date_str.replace('-', '年') + '日'
-    else:
-        from datetime import datetime
-        date_str = datetime.now().strftime('%Y-%m-%d')
-        display_date = datetime.now().strftime('%Y年%m月%d日')
+    md_file = args[0]
+    date_str, display_date = page_dates(md_file)
 
-    html = md_to_purple_html(md_file, date_str, display_date)
-    print(html)
+    # 直接流式写到stdout（末尾换行与原先 print 的输出一致）
+    writer = HtmlWriter(sys.stdout)
+    assets = publish_assets() if '--assets' in sys.argv[1:] else None
+    md_to_purple_html(md_file, date_str, display_date, writer, assets)
+    writer.write('\n')
+    writer.flush()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+近似重复检测（MinHash + LSH）
+- 对简报全文和每条新闻计算字符shingle的MinHash签名
+- 签名按band分桶存入归档索引（SQLite），查询只比较同桶的候选，不必遍历全部历史
+- 两个签名中相同分量的比例即Jaccard相似度的估计值
+"""
+
+import re
+import zlib
+import random
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+SHINGLE_SIZE = 5
+NUM_PERM = 128
+BANDS = 16  # 每个band 8行，候选阈值约为 (1/16)^(1/8) ≈ 0.71
+ROWS = NUM_PERM // BANDS
+
+# Mersenne素数 2^31-1，保证numpy与纯Python两种实现的计算结果一致
+PRIME = (1 << 31) - 1
+
+_rng = random.Random(20260124)
+PERM_A = [_rng.randrange(1, PRIME) for _ in range(NUM_PERM)]
+PERM_B = [_rng.randrange(0, PRIME) for _ in range(NUM_PERM)]
+
+# 与内容无关、每天都会变化的部分（日期、Markdown符号、空白）
+NOISE_PATTERN = re.compile(r'\d{4}\s*[年\-/.]\s*\d{1,2}\s*[月\-/.]\s*\d{1,2}\s*日?|[#*\-\[\]()>|`\s]+')
+ITEM_PATTERN = re.compile(r'^### .+?(?=^### |^## |^---|\Z)', re.M | re.S)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS minhash_signatures (
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    date TEXT NOT NULL,
+    signature TEXT NOT NULL,
+    PRIMARY KEY (kind, key)
+);
+CREATE TABLE IF NOT EXISTS minhash_buckets (
+    kind TEXT NOT NULL,
+    band INTEGER NOT NULL,
+    bucket INTEGER NOT NULL,
+    key TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_minhash_buckets ON minhash_buckets (kind, band, bucket);
+CREATE INDEX IF NOT EXISTS idx_minhash_buckets_key ON minhash_buckets (kind, key);
+"""
+
+def normalize(text):
+    """去掉日期、Markdown符号和空白"""
+    return NOISE_PATTERN.sub('', text)
+
+def shingles(text, k=SHINGLE_SIZE):
+    """字符k-gram集合（哈希为31位整数）"""
+    text = normalize(text)
+    if len(text) <= k:
+        return {zlib.crc32(text.encode('utf-8')) % PRIME} if text else set()
+    return {zlib.crc32(text[i:i + k].encode('utf-8')) % PRIME for i in range(len(text) - k + 1)}
+
+def signature(text):
+    """MinHash签名（长度 NUM_PERM 的整数列表）"""
+    hashes = shingles(text)
+    if not hashes:
+        return [PRIME] * NUM_PERM
+
+    if np is not None:
+        values = np.fromiter(hashes, dtype=np.int64)
+        a = np.array(PERM_A, dtype=np.int64)[:, None]
+        b = np.array(PERM_B, dtype=np.int64)[:, None]
+        return ((a * values[None, :] + b) % PRIME).min(axis=1).tolist()
+
+    return [min((a * h + b) % PRIME for h in hashes) for a, b in zip(PERM_A, PERM_B)]
+
+def similarity(sig1, sig2):
+    """由签名估计Jaccard相似度"""
+    return sum(1 for x, y in zip(sig1, sig2) if x == y) / NUM_PERM
+
+def band_buckets(sig):
+    """签名各band的桶编号"""
+    return [
+        zlib.crc32(','.join(map(str, sig[band * ROWS:(band + 1) * ROWS])).encode('ascii'))
+        for band in range(BANDS)
+    ]
+
+def split_items(content):
+    """按 ### 标题切分出每条新闻"""
+    return [match.group(0).strip() for match in ITEM_PATTERN.finditer(content)]
+
+def ensure_schema(conn):
+    conn.executescript(SCHEMA)
+
+def remove(conn, date):
+    """删除某天简报及其新闻条目的签名"""
+    for kind, pattern in (('briefing', date), ('item', f"{date}#%")):
+        keys = [row[0] for row in conn.execute(
+            "SELECT key FROM minhash_signatures WHERE kind = ? AND key LIKE ?", (kind, pattern))]
+        for key in keys:
+            conn.execute("DELETE FROM minhash_buckets WHERE kind = ? AND key = ?", (kind, key))
+            conn.execute("DELETE FROM minhash_signatures WHERE kind = ? AND key = ?", (kind, key))
+
+def add(conn, kind, key, date, sig):
+    """写入一个签名及其LSH分桶"""
+    conn.execute("INSERT OR REPLACE INTO minhash_signatures VALUES (?, ?, ?, ?)",
+                 (kind, key, date, ','.join(map(str, sig))))
+    conn.executemany("INSERT INTO minhash_buckets VALUES (?, ?, ?, ?)",
+                     [(kind, band, bucket, key) for band, bucket in enumerate(band_buckets(sig))])
+
+def index_briefing(conn, date, content):
+    """为一份简报及其每条新闻建立签名（替换旧签名）"""
+    remove(conn, date)
+    add(conn, 'briefing', date, date, signature(content))
+    for i, item in enumerate(split_items(content)):
+        add(conn, 'item', f"{date}#{i}", date, signature(item))
+
+def query(conn, sig, kind='briefing', threshold=0.7, exclude_date=None):
+    """查找与签名近似重复的已索引条目，返回 [(key, date, 相似度)]（相似度降序）"""
+    candidates = set()
+    for band, bucket in enumerate(band_buckets(sig)):
+        candidates.update(row[0] for row in conn.execute(
+            "SELECT key FROM minhash_buckets WHERE kind = ? AND band = ? AND bucket = ?",
+            (kind, band, bucket)))
+
+    results = []
+    for key in candidates:
+        row = conn.execute("SELECT date, signature FROM minhash_signatures WHERE kind = ? AND key = ?",
+                           (kind, key)).fetchone()
+        if not row or row[0] == exclude_date:
+            continue
+        score = similarity(sig, [int(x) for x in row[1].split(',')])
+        if score >= threshold:
+            results.append((key, row[0], score))
+
+    return sorted(results, key=lambda result: -result[2])
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+输出目录布局
+每天的页面只渲染一份正本（站点根目录的 YYYY-MM-DD.html），
+archive/ 和 output/archive/ 下的同名文件由正本派生，不再重复写入完整页面：
+- redirect: 生成几百字节的跳转页（默认；GitHub Pages 和 git 都能正常处理）
+- symlink:  相对路径符号链接（git 只保存链接本身，但 GitHub Pages 不跟随符号链接）
+- hardlink: 硬链接（只省本地磁盘，git 仍会按完整文件提交）
+- copy:     完整复制（旧行为）
+外链样式模式的正本引用 assets/ 下的共享文件，副本里的引用地址按副本所在目录改写；
+这种正本无法被子目录里的符号链接/硬链接共用，symlink/hardlink 模式下改为写完整副本
+
+用法:
+    python3 scripts/output_layout.py publish 2026-08-22 --assets   # 渲染正本并生成派生文件
+    python3 scripts/output_layout.py migrate --dry-run             # 预览如何收拢已有的重复文件
+    python3 scripts/output_layout.py migrate
+"""
+
+import os
+import re
+import sys
+import argparse
+from datetime import datetime
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.dirname(SCRIPT_DIR)
+sys.path.insert(0, SCRIPT_DIR)
+
+import page_template
+import md_to_purple_html
+
+# 派生副本所在目录（相对站点根目录）
+MIRROR_DIRS = ('archive', os.path.join('output', 'archive'))
+
+MODES = ('redirect', 'symlink', 'hardlink', 'copy')
+
+LAYOUT_MODE = os.getenv('OUTPUT_LAYOUT_MODE', 'redirect')
+
+DATE_PAGE_PATTERN = re.compile(r'^(\d{4}-\d{2}-\d{2})\.html$')
+
+_link_fallback_warned = False
+
+def canonical_path(date, site_dir=PROJECT_DIR):
+    """当天页面正本的路径"""
+    return os.path.join(site_dir, f"{date}.html")
+
+def mirror_paths(date, site_dir=PROJECT_DIR):
+    """当天页面各派生副本的路径"""
+    return [os.path.join(site_dir, mirror_dir, f"{date}.html") for mirror_dir in MIRROR_DIRS]
+
+def redirect_html(date, target):
+    """跳转到正本的小页面"""
+    return page_template.get('redirect.html').render(
+        target=target,
+        title=datetime.strptime(date, "%Y-%m-%d").strftime("%Y年%m月%d日 法律简报"),
+    )
+
+def _read(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+def is_redirect(path):
+    """是否为 redirect 模式生成的跳转页"""
+    return b'http-equiv="refresh"' in _read(path)
+
+def mirror_target(path, canonical):
+    """副本指向正本的相对地址"""
+    return os.path.relpath(canonical, os.path.dirname(path)).replace(os.sep, '/')
+
+def uses_assets(canonical):
+    """正本是否引用共享的样式/脚本文件（而不是内联）"""
+    return md_to_purple_html.ASSET_LINK_PATTERN.search(_read(canonical).decode('utf-8')) is not None
+
+def mirror_copy(path, canonical):
+    """完整副本的内容：正本中的共享资源地址改为相对副本所在目录"""
+    html = _read(canonical).decode('utf-8')
+    return md_to_purple_html.rebase_asset_links(
+        html, os.path.dirname(canonical), os.path.dirname(path)).encode('utf-8')
+
+def effective_mode(canonical, mode):
+    """引用共享资源的正本放到子目录后地址会失效，不能用链接共用，改为完整副本"""
+    if mode in ('symlink', 'hardlink') and os.path.exists(canonical) and uses_assets(canonical):
+        return 'copy'
+    return mode
+
+def mirror_size(path, canonical, mode, date):
+    """按 mode 生成的副本会占用的字节数（符号链接和硬链接按0计）"""
+    mode = effective_mode(canonical, mode)
+    if mode == 'redirect':
+        return len(redirect_html(date, mirror_target(path, canonical)).encode('utf-8'))
+    if mode == 'copy':
+        return len(mirror_copy(path, canonical))
+    return 0
+
+def expected_form(path, canonical, mode, date):
+    """副本已经是 mode 对应的形式时返回True"""
+    mode = effective_mode(canonical, mode)
+    if mode == 'symlink':
+        return os.path.islink(path) and os.readlink(path) == mirror_target(path, canonical)
+    if os.path.islink(path) or not os.path.exists(path) or not os.path.exists(canonical):
+        return False
+    if mode == 'hardlink':
+        return os.path.samefile(path, canonical)
+    if mode == 'redirect':
+        return _read(path) == redirect_html(date, mirror_target(path, canonical)).encode('utf-8')
+    return not os.path.samefile(path, canonical) and _read(path) == mirror_copy(path, canonical)
+
+def place_mirror(path, canonical, mode, date):
+    """按 mode 生成一个副本（先写临时路径再替换，中途失败不会留下半截文件）"""
+    global _link_fallback_warned
+
+    if effective_mode(canonical, mode) != mode:
+        if not _link_fallback_warned:
+            print(f"⚠️  正本引用共享样式文件，{mode} 副本改为完整复制（资源地址按副本目录改写）")
+            _link_fallback_warned = True
+        mode = 'copy'
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+
+    try:
+        if mode == 'redirect':
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(redirect_html(date, mirror_target(path, canonical)))
+        elif mode == 'symlink':
+            os.symlink(os.path.relpath(canonical, os.path.dirname(path)), tmp_path)
+        elif mode == 'hardlink':
+            os.link(canonical, tmp_path)
+        elif mode == 'copy':
+            with open(tmp_path, 'wb') as f:
+                f.write(mirror_copy(path, canonical))
+        else:
+            raise ValueError(f"未知的输出布局: {mode}")
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.lexists(tmp_path):
+            os.remove(tmp_path)
+
+def link_mirrors(date, site_dir=PROJECT_DIR, mode=LAYOUT_MODE):
+    """由正本生成当天的全部派生副本，返回有改动的路径"""
+    canonical = canonical_path(date, site_dir)
+    changed = []
+
+    for path in mirror_paths(date, site_dir):
+        if not expected_form(path, canonical, mode, date):
+            place_mirror(path, canonical, mode, date)
+            changed.append(path)
+
+    return changed
+
+def publish(date, md_file=None, site_dir=PROJECT_DIR, mode=LAYOUT_MODE, assets=None):
+    """渲染当天页面正本并生成派生副本，返回写入的全部路径"""
+    md_file = md_file or os.path.join(site_dir, 'output', 'archive', f"{date}.md")
+    canonical = canonical_path(date, site_dir)
+
+    md_to_purple_html.write_page(md_file, canonical, assets, site_dir)
+    return [canonical] + link_mirrors(date, site_dir, mode)
+
+def migrate(site_dir=PROJECT_DIR, mode=LAYOUT_MODE, dry_run=False, force=False):
+    """把已有的重复页面收拢为“正本 + 派生副本”
+
+    与正本内容相同的副本直接替换；正本缺失时先把第一份完整副本移为正本；
+    内容和正本不同的副本默认保留并报告（force=True 时也替换）。
+    返回 {'collapsed': [...], 'promoted': [...], 'kept': [...], 'saved_bytes': n}
+    """
+    dates = set()
+    for directory in ('',) + MIRROR_DIRS:
+        directory = os.path.join(site_dir, directory)
+        if os.path.isdir(directory):
+            dates.update(match.group(1) for match in map(DATE_PAGE_PATTERN.match, os.listdir(directory)) if match)
+
+    report = {'collapsed': [], 'promoted': [], 'kept': [], 'saved_bytes': 0}
+
+    for date in sorted(dates):
+        canonical = canonical_path(date, site_dir)
+        mirrors = [path for path in mirror_paths(date, site_dir) if os.path.lexists(path)]
+        # 正本内容的来源（预览模式下被“移为正本”的副本仍在原处）
+        source = canonical
+
+        if not os.path.exists(canonical):
+            full_copies = [path for path in mirrors if not os.path.islink(path) and not is_redirect(path)]
+            if not full_copies:
+                continue
+            source = full_copies[0]
+            report['promoted'].append(source)
+            if not dry_run:
+                # 副本里的共享资源地址是相对副本目录的，移到根目录前先改回来
+                content = mirror_copy(canonical, source)
+                with open(source, 'wb') as f:
+                    f.write(content)
+                os.replace(source, canonical)
+                source = canonical
+
+        for path in mirrors:
+            if expected_form(path, canonical, mode, date):
+                continue
+
+            # 已经是派生形式（链接或跳转页）的副本直接换成新形式，完整页面须与正本相同
+            # 被移为正本的副本原处已空，同样按派生形式补上
+            linked = os.path.islink(path) or not os.path.exists(path) or os.path.samefile(path, source)
+            derived = linked or is_redirect(path)
+            if not derived and _read(path) not in (_read(source), mirror_copy(path, source)) and not force:
+                report['kept'].append(path)
+                continue
+
+            old_size = 0 if linked else os.path.getsize(path)
+            report['saved_bytes'] += old_size - mirror_size(path, source, mode, date)
+            report['collapsed'].append(path)
+            if not dry_run:
+                place_mirror(path, canonical, mode, date)
+
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description='简报页面输出布局：一份正本 + 派生副本')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    publish_parser = subparsers.add_parser('publish', help='渲染页面正本并生成派生副本')
+    publish_parser.add_argument('dates', nargs='+', help='日期（YYYY-MM-DD）')
+    publish_parser.add_argument('--assets', action='store_true',
+                                help='样式/脚本引用共享的 assets/purple.<hash>.css/.js，不再内联')
+
+    migrate_parser = subparsers.add_parser('migrate', help='把已有的重复页面收拢为正本 + 派生副本')
+    migrate_parser.add_argument('--dry-run', action='store_true', help='只报告，不改动文件')
+    migrate_parser.add_argument('--force', action='store_true', help='内容与正本不同的副本也替换')
+
+    for sub in (publish_parser, migrate_parser):
+        sub.add_argument('--site-dir', default=PROJECT_DIR, help='站点根目录')
+        sub.add_argument('--mode', choices=MODES, default=LAYOUT_MODE, help='派生副本的形式')
+
+    args = parser.parse_args()
+
+    if args.command == 'publish':
+        assets = md_to_purple_html.publish_assets(args.site_dir) if args.assets else None
+        for date in args.dates:
+            for path in publish(date, site_dir=args.site_dir, mode=args.mode, assets=assets):
+                print(f"✅ {os.path.relpath(path, args.site_dir)}")
+        return
+
+    report = migrate(args.site_dir, args.mode, args.dry_run, args.force)
+    prefix = "（预览）" if args.dry_run else ""
+
+    for path in report['promoted']:
+        print(f"📄 {prefix}移为正本: {os.path.relpath(path, args.site_dir)}")
+    for path in report['kept']:
+        print(f"⚠️  {prefix}内容与正本不同，保留: {os.path.relpath(path, args.site_dir)}")
+    print(f"✅ {prefix}收拢 {len(report['collapsed'])} 个副本为 {args.mode}，"
+          f"节省约 {report['saved_bytes'] / 1024:.0f}KB")
+
+if __name__ == '__main__':
+    main()
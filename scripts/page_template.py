@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+页面模板层
+HTML骨架和样式放在 scripts/templates/ 下，改主题不用动Python代码
+模板语法沿用标准库 string.Template：${name} 为占位符，$$ 输出字面的 $
+
+每个模板只解析一次，编译成“字面片段/占位符”序列并按文件修改时间缓存；
+批量渲染成千上万个页面时直接按序列写出，不再重复构造大字符串或扫描模板
+"""
+
+import os
+import string
+import hashlib
+
+from html_writer import HtmlWriter
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+TEMPLATE_DIR = os.getenv('TEMPLATE_DIR', os.path.join(SCRIPT_DIR, 'templates'))
+
+# {(路径, 类型): (修改时间, 结果)}
+_cache = {}
+
+class CompiledTemplate:
+    """编译后的模板：parts 中 str 为字面片段，tuple (name,) 为占位符"""
+
+    __slots__ = ('name', 'parts')
+
+    def __init__(self, name, source):
+        self.name = name
+        self.parts = []
+
+        pos = 0
+        for match in string.Template.pattern.finditer(source):
+            literal = source[pos:match.start()]
+            pos = match.end()
+
+            if match.group('escaped') is not None:
+                literal += '$'
+                placeholder = None
+            elif match.group('invalid') is not None:
+                lineno = source.count('\n', 0, match.start()) + 1
+                raise ValueError(f"模板 {name} 第{lineno}行: 无效的占位符")
+            else:
+                placeholder = match.group('named') or match.group('braced')
+
+            self._append(literal)
+            if placeholder:
+                self.parts.append((placeholder,))
+
+        self._append(source[pos:])
+
+    def _append(self, literal):
+        """追加字面片段，相邻片段合并"""
+        if not literal:
+            return
+        if self.parts and isinstance(self.parts[-1], str):
+            self.parts[-1] += literal
+        else:
+            self.parts.append(literal)
+
+    def render(self, out=None, **values):
+        """按顺序写出模板
+
+        值为字符串（或其他可转成字符串的对象）时直接写入；
+        值为可调用对象时以 write 函数调用它，由它自己写出片段（用于循环生成的卡片、条目等）
+        out 为 HtmlWriter 时写入其中并返回None，否则返回完整字符串
+        """
+        writer = out if out is not None else HtmlWriter()
+        write = writer.write
+
+        for part in self.parts:
+            if isinstance(part, str):
+                write(part)
+                continue
+
+            try:
+                value = values[part[0]]
+            except KeyError:
+                raise KeyError(f"模板 {self.name} 缺少参数: {part[0]}") from None
+
+            if callable(value):
+                value(write)
+            else:
+                write(str(value))
+
+        if out is None:
+            return writer.getvalue()
+
+def _cached(name, kind, build):
+    path = os.path.join(TEMPLATE_DIR, name)
+    mtime = os.stat(path).st_mtime_ns
+
+    cached = _cache.get((path, kind))
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    with open(path, 'r', encoding='utf-8') as f:
+        result = build(f.read())
+    _cache[(path, kind)] = (mtime, result)
+    return result
+
+def get(name):
+    """获取编译后的模板（文件修改后自动重新编译）"""
+    return _cached(name, 'template', lambda source: CompiledTemplate(name, source))
+
+def load_text(name):
+    """读取不含占位符的静态文件（样式、脚本），同样按修改时间缓存"""
+    return _cached(name, 'text', lambda source: source)
+
+def version(*names):
+    """模板内容的哈希，作为构建清单里的模板版本"""
+    digest = hashlib.sha256()
+    for name in names:
+        digest.update(name.encode('utf-8') + b'\0')
+        digest.update(load_text(name).encode('utf-8') + b'\0')
+    return digest.hexdigest()[:16]
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+批量重建简报页面
+把 output/archive/*.md（全部或指定日期范围）用进程池并行渲染为紫色主题HTML，
+每个工作进程只导入一次渲染模块、编译一次模板，输出文件原子写入
+
+用法:
+    python3 scripts/rebuild.py                         # 重建全部
+    python3 scripts/rebuild.py --from 2026-03-01 --to 2026-03-31
+    python3 scripts/rebuild.py 2026-08-21 2026-08-22 --assets
+"""
+
+import os
+import re
+import sys
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.dirname(SCRIPT_DIR)
+sys.path.insert(0, SCRIPT_DIR)
+
+import md_to_purple_html
+
+ARCHIVE_DIR = os.path.join(PROJECT_DIR, 'output', 'archive')
+
+DATE_FILE_PATTERN = re.compile(r'^(\d{4}-\d{2}-\d{2})\.md$')
+
+# 每个任务打包的文件数，减少进程间往返
+CHUNK_SIZE = 8
+
+def select_sources(archive_dir=None, start=None, end=None, dates=None):
+    """按日期排序返回要重建的 [(日期, Markdown路径)]
+
+    dates 给出时只取这些日期；否则取 [start, end] 范围（两端可省略）
+    """
+    archive_dir = archive_dir or ARCHIVE_DIR
+    wanted = set(dates) if dates else None
+    sources = []
+
+    for name in sorted(os.listdir(archive_dir)):
+        match = DATE_FILE_PATTERN.match(name)
+        if not match:
+            continue
+
+        date = match.group(1)
+        if wanted is not None and date not in wanted:
+            continue
+        if start and date < start or end and date > end:
+            continue
+        sources.append((date, os.path.join(archive_dir, name)))
+
+    return sources
+
+def _render(job):
+    """工作进程：渲染单个页面，返回 (输出路径, 错误信息)"""
+    md_file, html_file, assets = job
+    try:
+        md_to_purple_html.write_page(md_file, html_file, assets)
+    except Exception as e:
+        return html_file, f"{type(e).__name__}: {e}"
+    return html_file, None
+
+def rebuild(sources, output_dir=PROJECT_DIR, jobs=None, assets=None):
+    """并行渲染 sources，返回失败的 [(输出路径, 错误信息)]"""
+    jobs_list = [(md_file, os.path.join(output_dir, f"{date}.html"), assets)
+                 for date, md_file in sources]
+    if not jobs_list:
+        return []
+
+    workers = min(jobs or os.cpu_count() or 1, len(jobs_list))
+    if workers == 1:
+        results = map(_render, jobs_list)
+        return [(path, error) for path, error in results if error]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(_render, jobs_list, chunksize=CHUNK_SIZE)
+        return [(path, error) for path, error in results if error]
+
+def main():
+    parser = argparse.ArgumentParser(description='批量重建简报HTML页面')
+    parser.add_argument('dates', nargs='*', help='只重建这些日期（YYYY-MM-DD）')
+    parser.add_argument('--from', dest='start', help='起始日期（含）')
+    parser.add_argument('--to', dest='end', help='结束日期（含）')
+    parser.add_argument('--archive-dir', default=ARCHIVE_DIR, help='Markdown归档目录')
+    parser.add_argument('--output-dir', default=PROJECT_DIR, help='HTML输出目录')
+    parser.add_argument('-j', '--jobs', type=int, default=None, help='工作进程数（默认CPU核数）')
+    parser.add_argument('--assets', action='store_true',
+                        help='样式/脚本引用共享的 assets/purple.<hash>.css/.js，不再内联')
+    args = parser.parse_args()
+
+    sources = select_sources(args.archive_dir, args.start, args.end, args.dates)
+    if not sources:
+        print("⚠️  没有符合条件的简报")
+        return
+
+    # 共享样式/脚本在主进程里写一次，工作进程只拿到引用地址
+    assets = md_to_purple_html.publish_assets(args.output_dir) if args.assets else None
+
+    start = time.perf_counter()
+    failures = rebuild(sources, args.output_dir, args.jobs, assets)
+    elapsed = time.perf_counter() - start
+
+    for path, error in failures:
+        print(f"⚠️  {path}: {error}")
+
+    print(f"✅ 已重建 {len(sources) - len(failures)}/{len(sources)} 个页面"
+          f"（{sources[0][0]} ~ {sources[-1][0]}），耗时 {elapsed:.2f}秒")
+
+    if failures:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
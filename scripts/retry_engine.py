@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+重试引擎
+- 带随机抖动的指数退避（读取 config/glm_config.json 的 retry 配置）
+- 按端点的熔断器：连续失败达到阈值后短路，冷却后半开、只放行一个试探请求
+- 总时间预算：所有尝试加等待不超过预算，避免单个端点耗尽定时任务窗口
+"""
+
+import time
+import random
+import threading
+
+import requests
+
+class RetryError(Exception):
+    """所有尝试均失败或预算耗尽"""
+
+class CircuitOpenError(RetryError):
+    """端点处于熔断状态，未发送请求"""
+
+class RetryableStatusError(Exception):
+    """服务器返回可重试的状态码（429/5xx）"""
+
+    def __init__(self, status_code, message=''):
+        super().__init__(f"HTTP {status_code} {message}".strip())
+        self.status_code = status_code
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+RETRYABLE_EXCEPTIONS = (
+    requests.ConnectionError,
+    requests.Timeout,
+    RetryableStatusError,
+)
+
+class RetryPolicy:
+    """重试参数"""
+
+    def __init__(self, max_attempts=3, timeout=30, backoff_factor=2,
+                 base_delay=1.0, max_delay=30.0, total_budget=120.0):
+        self.max_attempts = max(1, int(max_attempts))
+        self.timeout = timeout
+        self.backoff_factor = backoff_factor
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.total_budget = total_budget
+
+    @classmethod
+    def from_config(cls, config):
+        """从glm_config.json的retry段构建"""
+        retry = (config or {}).get('retry', {})
+        return cls(
+            max_attempts=retry.get('max_attempts', 3),
+            timeout=retry.get('timeout', 30),
+            backoff_factor=retry.get('backoff_factor', 2),
+            base_delay=retry.get('base_delay', 1.0),
+            max_delay=retry.get('max_delay', 30.0),
+            total_budget=retry.get('total_budget', 120.0)
+        )
+
+    def backoff(self, attempt):
+        """第attempt次失败后的等待时间（full jitter）"""
+        ceiling = min(self.max_delay, self.base_delay * self.backoff_factor ** (attempt - 1))
+        return random.uniform(0, ceiling)
+
+class CircuitBreaker:
+    """单个端点的熔断器
+
+    关闭：正常放行；连续失败达到阈值后打开：全部拒绝；
+    冷却结束后半开：只放行一个试探请求，其余调用在试探有结果前仍被拒绝，
+    试探成功则关闭，失败则重新打开并重新计时
+    """
+
+    def __init__(self, failure_threshold=3, reset_timeout=300):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """是否允许发送请求（半开状态下由第一个调用者占用唯一的试探名额）"""
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if self.probing or time.monotonic() - self.opened_at < self.reset_timeout:
+                return False
+            self.probing = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self.probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.probing or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+            self.probing = False
+
+    def release(self):
+        """试探请求没有得出结论（如抛出不可重试的异常）时交还名额，保持打开状态"""
+        with self._lock:
+            self.probing = False
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+def get_breaker(endpoint, config=None):
+    """获取端点的熔断器（进程内共享）"""
+    with _breakers_lock:
+        if endpoint not in _breakers:
+            settings = (config or {}).get('circuit_breaker', {})
+            _breakers[endpoint] = CircuitBreaker(
+                failure_threshold=settings.get('failure_threshold', 3),
+                reset_timeout=settings.get('reset_timeout', 300)
+            )
+        return _breakers[endpoint]
+
+def call_with_retry(func, endpoint, policy=None, breaker=None):
+    """带重试、熔断和总预算地调用 func(timeout)
+
+    func 接收本次尝试可用的超时时间（秒）；抛出 RETRYABLE_EXCEPTIONS 时重试，
+    其他异常直接向上抛出。全部失败时抛出 RetryError。
+    """
+    policy = policy or RetryPolicy()
+    breaker = breaker or get_breaker(endpoint)
+    deadline = time.monotonic() + policy.total_budget
+    last_error = None
+
+    for attempt in range(1, policy.max_attempts + 1):
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+
+        if not breaker.allow():
+            raise CircuitOpenError(f"{endpoint} 已熔断，跳过请求")
+
+        try:
+            result = func(min(policy.timeout, remaining))
+        except RETRYABLE_EXCEPTIONS as e:
+            last_error = e
+            breaker.record_failure()
+            print(f"⚠️  第{attempt}/{policy.max_attempts}次请求失败: {e}")
+        except BaseException:
+            breaker.release()
+            raise
+        else:
+            breaker.record_success()
+            return result
+
+        if attempt < policy.max_attempts:
+            delay = min(policy.backoff(attempt), max(0.0, deadline - time.monotonic()))
+            if delay > 0:
+                print(f"   {delay:.1f}s 后重试...")
+                time.sleep(delay)
+
+    raise RetryError(f"{endpoint} 请求失败（{last_error or '超出时间预算'}）")
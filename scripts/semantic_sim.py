@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+新闻标题语义相似度（字符n-gram TF-IDF）
+归档中所有历史标题向量化后建倒排索引（term -> 含该词的历史标题及权重），内存只随非零元素数增长；
+可用NumPy时倒排索引存成CSC数组，一批新标题与全部历史的打分是一次向量化的稀疏矩阵乘积，
+否则新标题沿自己含有的词项用纯Python累加得分
+IDF和倒排索引缓存在 .cache/ 下（与归档索引同目录），历史标题不变时直接载入
+"""
+
+import os
+import sys
+import json
+import math
+import time
+import hashlib
+from collections import Counter, defaultdict
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.dirname(SCRIPT_DIR)
+
+import fingerprint
+
+# 中文标题以单字和双字组合为主，更长的n-gram对改写过的标题几乎没有命中
+NGRAM_RANGE = (1, 2)
+
+# 缓存的IDF/倒排索引（与 archive_index 的SQLite索引同在 .cache/ 下）
+INDEX_CACHE = os.getenv('TFIDF_INDEX_CACHE', os.path.join(PROJECT_DIR, '.cache', 'tfidf_index.json'))
+
+# 缓存格式或权重公式变化时递增
+INDEX_CACHE_VERSION = 1
+
+def ngrams(text, ngram_range=NGRAM_RANGE):
+    """归一化后的字符n-gram计数"""
+    text = fingerprint.normalize_title(text)
+    low, high = ngram_range
+    return Counter(text[i:i + n] for n in range(low, high + 1) for i in range(len(text) - n + 1))
+
+def build_state(texts):
+    """历史标题的IDF和倒排索引，可直接存为JSON
+
+    {'idf': {term: idf}, 'postings': {term: [[行号...], [权重...]]}}，权重为L2归一化后的TF-IDF
+    """
+    counts = [ngrams(text) for text in texts]
+
+    df = Counter(term for count in counts for term in count)
+    total = len(counts)
+    idf = {term: math.log((1 + total) / (1 + freq)) + 1 for term, freq in df.items()}
+
+    postings = defaultdict(lambda: [[], []])
+    for row, count in enumerate(counts):
+        for term, weight in tfidf_weights(count, idf).items():
+            rows, weights = postings[term]
+            rows.append(row)
+            weights.append(weight)
+
+    return {'idf': idf, 'postings': dict(postings)}
+
+def tfidf_weights(count, idf):
+    """n-gram计数 -> L2归一化的TF-IDF权重（不在词表中的n-gram忽略）"""
+    weights = {term: (1 + math.log(tf)) * idf[term] for term, tf in count.items() if term in idf}
+    norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+    return {term: w / norm for term, w in weights.items()}
+
+def texts_digest(texts):
+    """历史标题列表的哈希，作为缓存的索引是否可用的依据"""
+    digest = hashlib.sha256(f"{INDEX_CACHE_VERSION} {NGRAM_RANGE}".encode('utf-8'))
+    for text in texts:
+        digest.update(text.encode('utf-8') + b'\0')
+    return digest.hexdigest()
+
+class TfidfIndex:
+    """历史标题的稀疏TF-IDF矩阵（行向量已L2归一化，点积即余弦相似度）"""
+
+    def __init__(self, texts, keys=None, state=None):
+        self.keys = list(keys) if keys is not None else list(range(len(texts)))
+        state = state or build_state(texts)
+        self.idf = state['idf']
+
+        if np is not None:
+            self._to_csc(state['postings'])
+        else:
+            self.postings = state['postings']
+
+    @classmethod
+    def cached(cls, texts, keys=None, cache_file=None):
+        """历史标题与缓存一致时直接载入缓存的IDF和倒排索引，否则重建并写入缓存"""
+        cache_file = cache_file or INDEX_CACHE
+        digest = texts_digest(texts)
+
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            if cached.get('digest') == digest:
+                return cls(texts, keys, state=cached)
+        except (FileNotFoundError, ValueError):
+            pass
+
+        state = build_state(texts)
+        os.makedirs(os.path.dirname(cache_file) or '.', exist_ok=True)
+        tmp_path = f"{cache_file}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(dict(state, digest=digest), f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, cache_file)
+
+        return cls(texts, keys, state=state)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def _to_csc(self, postings):
+        """倒排索引压缩成CSC数组：第 i 个词项的行号/权重为 indices/data[indptr[i]:indptr[i + 1]]"""
+        terms = list(postings)
+        self.columns = {term: i for i, term in enumerate(terms)}
+
+        self.indptr = np.zeros(len(terms) + 1, dtype=np.int64)
+        np.cumsum([len(postings[term][0]) for term in terms], out=self.indptr[1:])
+        nnz = int(self.indptr[-1])
+        self.indices = np.fromiter((row for term in terms for row in postings[term][0]),
+                                   dtype=np.int64, count=nnz)
+        self.data = np.fromiter((weight for term in terms for weight in postings[term][1]),
+                                dtype=np.float64, count=nnz)
+
+    def _sparse_product(self, queries):
+        """查询矩阵（COO）× 历史矩阵转置（CSC），一次向量化完成
+
+        每个查询词项对应历史矩阵的一整列：把这些列段展开拼接、与查询权重逐元素相乘，
+        再按 (查询, 历史行) 用 bincount 累加，不逐个词项循环
+        """
+        rows, columns, weights = [], [], []
+        for row, query in enumerate(queries):
+            for term, weight in query.items():
+                column = self.columns.get(term)
+                if column is not None:
+                    rows.append(row)
+                    columns.append(column)
+                    weights.append(weight)
+
+        width = len(self.keys)
+        if not columns:
+            return np.zeros((len(queries), width))
+
+        columns = np.asarray(columns, dtype=np.int64)
+        starts = self.indptr[columns]
+        lengths = self.indptr[columns + 1] - starts
+        # 展开后第 k 个元素在 indices/data 中的位置
+        positions = np.arange(int(lengths.sum())) + np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+
+        products = np.repeat(np.asarray(weights), lengths) * self.data[positions]
+        targets = np.repeat(np.asarray(rows, dtype=np.int64), lengths) * width + self.indices[positions]
+        return np.bincount(targets, weights=products, minlength=len(queries) * width).reshape(len(queries), width)
+
+    def scores(self, texts):
+        """返回 len(texts) × len(历史) 的余弦相似度（NumPy数组或嵌套列表）"""
+        queries = [tfidf_weights(ngrams(text), self.idf) for text in texts]
+
+        if np is not None:
+            return self._sparse_product(queries)
+
+        result = []
+        for weights in queries:
+            row = [0.0] * len(self.keys)
+            for term, weight in weights.items():
+                docs, doc_weights = self.postings.get(term, ((), ()))
+                for doc, doc_weight in zip(docs, doc_weights):
+                    row[doc] += weight * doc_weight
+            result.append(row)
+        return result
+
+    def best_matches(self, texts, threshold=0.0):
+        """每个文本在历史中的最佳匹配 [(key, 相似度) 或 None]"""
+        if not self.keys or not texts:
+            return [None] * len(texts)
+
+        matches = []
+        for row in self.scores(texts):
+            if np is not None:
+                best = int(row.argmax())
+                score = float(row[best])
+            else:
+                best = max(range(len(row)), key=row.__getitem__)
+                score = row[best]
+            matches.append((self.keys[best], score) if score >= threshold else None)
+        return matches
+
+if __name__ == '__main__':
+    # 基准：用整个归档构建索引，给最新一天的标题打分
+    sys.path.insert(0, SCRIPT_DIR)
+    import archive_index
+
+    latest = archive_index.list_briefings(limit=1)
+    exclude = latest[0]['date'] if latest else None
+    history = archive_index.load_item_titles(exclude_date=exclude)
+
+    start = time.perf_counter()
+    index = TfidfIndex.cached([title for title, _ in history], keys=history)
+    built = time.perf_counter()
+
+    titles = [title for _, title in latest[0]['headlines']] if latest else []
+    matches = index.best_matches(titles)
+    scored = time.perf_counter()
+
+    backend = 'numpy' if np is not None else 'pure-python'
+    print(f"✅ {backend}: {len(index)} 条历史标题建模 {(built - start) * 1000:.1f}ms，"
+          f"{len(titles)} 条新标题打分 {(scored - built) * 1000:.2f}ms")
+    for title, match in zip(titles, matches):
+        if match:
+            (hist_title, date), score = match
+            print(f"   {score:.2f}  {title}  ≈  {hist_title} ({date})")
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+GLM Token账本
+按天记录每次调用的prompt/completion token，执行 cost_control.max_daily_tokens 预算：
+预算不足时压缩max_tokens，连最小输出都不够时拒绝请求
+检查预算和预留额度在同一把锁内完成，并发的调用不会一起通过检查后合计超支
+"""
+
+import os
+import json
+import itertools
+import threading
+from datetime import datetime
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.dirname(SCRIPT_DIR)
+
+LEDGER_DIR = os.getenv('TOKEN_LEDGER_DIR', os.path.join(PROJECT_DIR, '.cache', 'tokens'))
+
+DEFAULT_DAILY_TOKENS = 100000
+
+# 压缩后max_tokens的下限，低于此值直接拒绝（输出太短没有意义）
+MIN_COMPLETION_TOKENS = 500
+
+_ledger_lock = threading.Lock()
+
+# 已预留、尚未记账的token {预留编号: token数}（进程内，并发的板块生成共享）
+_pending = {}
+_reservation_ids = itertools.count(1)
+
+class BudgetExceededError(Exception):
+    """今日token预算已用完"""
+
+def ledger_path(day=None):
+    """某天的账本文件路径"""
+    day = day or datetime.now().strftime("%Y-%m-%d")
+    return os.path.join(LEDGER_DIR, f"{day}.json")
+
+def load_ledger(day=None):
+    """读取某天的账本"""
+    day = day or datetime.now().strftime("%Y-%m-%d")
+
+    try:
+        with open(ledger_path(day), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {
+            'date': day,
+            'prompt_tokens': 0,
+            'completion_tokens': 0,
+            'total_tokens': 0,
+            'calls': []
+        }
+
+def daily_limit(config=None):
+    """每日token上限"""
+    return (config or {}).get('cost_control', {}).get('max_daily_tokens', DEFAULT_DAILY_TOKENS)
+
+def _remaining(config=None, day=None):
+    """今日剩余token（扣除已预留的部分），须在 _ledger_lock 内调用"""
+    return max(0, daily_limit(config) - load_ledger(day)['total_tokens'] - sum(_pending.values()))
+
+def remaining_budget(config=None, day=None):
+    """今日剩余token（扣除进行中的调用已预留的部分）"""
+    with _ledger_lock:
+        return _remaining(config, day)
+
+def estimate_prompt_tokens(prompt):
+    """粗略估算prompt的token数（中文约每字一个token，偏保守）"""
+    return len(prompt)
+
+def reserve(prompt, max_tokens, config=None):
+    """按剩余预算调整max_tokens并预留额度，返回 (预留编号, max_tokens)
+
+    预算充足时原样使用max_tokens；不足时压缩到剩余可用量；
+    剩余量连 MIN_COMPLETION_TOKENS 都不够时抛出 BudgetExceededError。
+    预留的额度在 record_usage(..., reservation=编号) 时按实际用量结算，调用失败时用 release 交还。
+    """
+    prompt_tokens = estimate_prompt_tokens(prompt)
+
+    with _ledger_lock:
+        remaining = _remaining(config)
+        available = remaining - prompt_tokens
+
+        if available < min(max_tokens, MIN_COMPLETION_TOKENS):
+            raise BudgetExceededError(
+                f"今日token预算不足（剩余 {remaining}，上限 {daily_limit(config)}）"
+            )
+
+        granted = min(max_tokens, available)
+        reservation = next(_reservation_ids)
+        _pending[reservation] = prompt_tokens + granted
+
+    if granted < max_tokens:
+        print(f"💰 token预算紧张，max_tokens {max_tokens} → {granted}")
+    return reservation, granted
+
+def release(reservation):
+    """交还未用上的预留额度（调用失败、没有产生用量时）"""
+    with _ledger_lock:
+        _pending.pop(reservation, None)
+
+def record_usage(usage, model=None, purpose=None, day=None, reservation=None):
+    """记录一次调用的token用量（同时结算 reservation 对应的预留额度），返回今日累计用量"""
+    usage = usage or {}
+    prompt_tokens = int(usage.get('prompt_tokens', 0))
+    completion_tokens = int(usage.get('completion_tokens', 0))
+    total_tokens = int(usage.get('total_tokens', prompt_tokens + completion_tokens))
+
+    with _ledger_lock:
+        _pending.pop(reservation, None)
+        ledger = load_ledger(day)
+        ledger['prompt_tokens'] += prompt_tokens
+        ledger['completion_tokens'] += completion_tokens
+        ledger['total_tokens'] += total_tokens
+        ledger['calls'].append({
+            'time': datetime.now().strftime("%H:%M:%S"),
+            'model': model,
+            'purpose': purpose,
+            'prompt_tokens': prompt_tokens,
+            'completion_tokens': completion_tokens,
+            'total_tokens': total_tokens
+        })
+
+        os.makedirs(LEDGER_DIR, exist_ok=True)
+        path = ledger_path(ledger['date'])
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(ledger, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+
+    return ledger['total_tokens']